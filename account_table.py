@@ -0,0 +1,290 @@
+"""
+Virtualized account table for the GUI
+
+The Treeview only ever holds enough rows to fill its visible height; the
+scrollbar moves a window over an in-memory model, so thousands of accounts
+cost no more to display than ten.
+"""
+
+import json
+import os
+import time
+from bisect import bisect_left
+import tkinter as tk
+from dataclasses import dataclass
+from pathlib import Path
+from tkinter import ttk
+
+
+SHIFT_MASK = 0x0001
+CONTROL_MASK = 0x0004
+
+LABELS_FILE = Path(os.getenv('APPDATA') or Path.home()) / "saunis server swapper" / "account_labels.json"
+
+
+@dataclass
+class AccountEntry:
+    """One account folder shown in the table"""
+    account_id: str
+    file_path: Path
+    server: str | None
+    modified: float
+    label: str = ""
+
+    @property
+    def key(self) -> str:
+        return str(self.file_path)
+
+
+def load_account_labels() -> dict[str, str]:
+    """Known usernames, keyed by lowercase Ubisoft ID"""
+    try:
+        with open(LABELS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_account_label(ubisoft_id: str, label: str):
+    """Remember the username a Ubisoft ID was resolved from"""
+    labels = load_account_labels()
+    labels[ubisoft_id.lower()] = label
+    try:
+        LABELS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(LABELS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(labels, f, indent=1)
+    except OSError:
+        pass
+
+
+class AccountTable(tk.Frame):
+    """
+    Scrollable, filterable, multi-select account list backed by a fixed pool of Treeview rows
+    """
+
+    COLUMNS = (
+        ("label", "Label", 80),
+        ("account", "Account", 255),
+        ("server", "Server", 80),
+        ("modified", "Modified", 115),
+    )
+
+    def __init__(self, master, rows: int = 8, server_names: dict[str, str] | None = None,
+                 style: str = 'Treeview', **kwargs):
+        """
+        Args:
+            master: Parent widget
+            rows: Number of visible rows (the size of the row pool)
+            server_names: DataCenterHint value -> display name
+            style: ttk style for the Treeview
+        """
+        super().__init__(master, **kwargs)
+        self.rows = rows
+        self.server_names = server_names or {}
+
+        self._entries = {}      # key -> AccountEntry
+        self._order = []        # keys in arrival order
+        self._position = {}     # key -> index in _order
+        self._view = []         # keys passing the filter
+        self._selected = set()  # selected keys (survives scrolling and filtering)
+        self._filter = ""
+        self._offset = 0
+        self._render_pending = False
+
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in self.COLUMNS], show='headings',
+                                 height=rows, selectmode='extended', style=style)
+        for name, heading, width in self.COLUMNS:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width, stretch=(name == "account"))
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # The fixed row pool; rows past the end of the view are detached
+        self._row_ids = [self.tree.insert('', tk.END, iid=f"row{i}") for i in range(rows)]
+        self._attached = rows
+        self._row_keys = [None] * rows
+
+        self.tree.bind('<ButtonPress-1>', self._on_click)
+        self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+        self.tree.bind('<Prior>', lambda e: self.scroll(-rows) or "break")
+        self.tree.bind('<Next>', lambda e: self.scroll(rows) or "break")
+        self.tree.bind('<Control-a>', lambda e: self.select_all() or "break")
+
+        self._render()
+
+    # Model
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def visible_count(self) -> int:
+        return len(self._view)
+
+    def _matches(self, entry: AccountEntry) -> bool:
+        if not self._filter:
+            return True
+        server = entry.server or ""
+        haystack = f"{entry.label}\n{entry.account_id}\n{server}\n{self.server_names.get(server, '')}".lower()
+        return self._filter in haystack
+
+    def _refresh_view(self, key: str) -> bool:
+        """Add key to or drop it from the filtered view after its fields changed; True if the view changed"""
+        # _view keeps arrival order, so a key's slot can be found by bisection
+        index = bisect_left(self._view, self._position[key], key=self._position.__getitem__)
+        in_view = index < len(self._view) and self._view[index] == key
+        if self._matches(self._entries[key]) == in_view:
+            return False
+        if in_view:
+            del self._view[index]
+        else:
+            self._view.insert(index, key)
+        return True
+
+    def add_entries(self, entries: list[AccountEntry]):
+        """Add or refresh a batch of accounts (e.g. as a scan streams in)"""
+        for entry in entries:
+            key = entry.key
+            if key in self._entries:
+                self._entries[key] = entry
+                self._refresh_view(key)
+                continue
+            self._position[key] = len(self._order)
+            self._order.append(key)
+            self._entries[key] = entry
+            if self._matches(entry):
+                self._view.append(key)
+        self._schedule_render()
+
+    def update_entry(self, key: str, **changes):
+        """Change fields of one account (e.g. after its server was changed)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        for name, value in changes.items():
+            setattr(entry, name, value)
+        if self._refresh_view(key) or key in self._row_keys:
+            self._schedule_render()
+
+    def set_label(self, account_id: str, label: str):
+        """Label every folder of an account"""
+        account_id = account_id.lower()
+        for entry in self._entries.values():
+            if entry.account_id.lower() == account_id:
+                entry.label = label
+                self._refresh_view(entry.key)
+        self._schedule_render()
+
+    def clear(self):
+        self._entries.clear()
+        self._order.clear()
+        self._position.clear()
+        self._view.clear()
+        self._selected.clear()
+        self._offset = 0
+        self._schedule_render()
+
+    def set_filter(self, text: str):
+        """Show only accounts whose label, ID or server contains text (case-insensitive)"""
+        self._filter = text.strip().lower()
+        self._view = [key for key in self._order if self._matches(self._entries[key])]
+        self._offset = 0
+        self._schedule_render()
+
+    def select_all(self):
+        """Select every account that passes the current filter"""
+        self._selected.update(self._view)
+        self._schedule_render()
+
+    def selected_entries(self) -> list[AccountEntry]:
+        """Selected accounts that pass the current filter, in display order"""
+        return [self._entries[key] for key in self._view if key in self._selected]
+
+    # Scrolling
+
+    def scroll(self, rows: int):
+        self._set_offset(self._offset + rows)
+
+    def _set_offset(self, offset: int):
+        offset = max(0, min(offset, len(self._view) - self.rows))
+        if offset != self._offset:
+            self._offset = offset
+            self._schedule_render()
+
+    def _on_scrollbar(self, action, *args):
+        if action == tk.MOVETO:
+            self._set_offset(round(float(args[0]) * len(self._view)))
+        elif action == tk.SCROLL:
+            count, what = int(args[0]), args[1]
+            self.scroll(count * (self.rows if what == tk.PAGES else 1))
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120 per notch
+        self.scroll(-3 * int(event.delta / 120) if abs(event.delta) >= 120 else -event.delta)
+        return "break"
+
+    # Rendering
+
+    def _schedule_render(self):
+        # Coalesce bursts of model updates into one redraw
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _format(self, entry: AccountEntry) -> tuple:
+        server = entry.server
+        server_text = self.server_names.get(server, server) if server is not None else "(not set)"
+        modified = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.modified))
+        return (entry.label, entry.account_id, server_text, modified)
+
+    def _render(self):
+        self._render_pending = False
+        self._offset = max(0, min(self._offset, len(self._view) - self.rows))
+        shown = max(0, min(self.rows, len(self._view) - self._offset))
+
+        # Attach/detach pooled rows so only real accounts are visible
+        while self._attached < shown:
+            self.tree.move(self._row_ids[self._attached], '', self._attached)
+            self._attached += 1
+        while self._attached > shown:
+            self._attached -= 1
+            self.tree.detach(self._row_ids[self._attached])
+
+        selection = []
+        for i in range(self.rows):
+            if i < shown:
+                key = self._view[self._offset + i]
+                self._row_keys[i] = key
+                self.tree.item(self._row_ids[i], values=self._format(self._entries[key]))
+                if key in self._selected:
+                    selection.append(self._row_ids[i])
+            else:
+                self._row_keys[i] = None
+        self.tree.selection_set(selection)
+
+        total = len(self._view)
+        if total > self.rows:
+            self.scrollbar.set(self._offset / total, (self._offset + shown) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_click(self, event):
+        # A plain click starts a new selection, including rows scrolled out of view
+        if not event.state & (SHIFT_MASK | CONTROL_MASK):
+            self._selected.clear()
+
+    def _on_tree_select(self, event=None):
+        # Mirror the pooled rows' selection into the model
+        selected_rows = set(self.tree.selection())
+        for row_id, key in zip(self._row_ids, self._row_keys):
+            if key is None:
+                continue
+            if row_id in selected_rows:
+                self._selected.add(key)
+            else:
+                self._selected.discard(key)
@@ -0,0 +1,99 @@
+"""
+Benchmark for GameSettings.ini editing.
+Generates thousands of synthetic account files and compares the legacy
+line-scan update (one key per read/write) with batched edits through
+GameSettingsDocument (many keys per read/write).
+"""
+
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from game_settings_manager import GameSettingsDocument, update_settings
+
+
+FILE_COUNT = 5000
+EDITS_PER_FILE = 10
+
+
+def make_settings_text(rng: random.Random) -> str:
+    """Roughly the shape and size of a real GameSettings.ini"""
+    sections = ["DISPLAY", "GRAPHICS", "AUDIO", "INPUT", "GAMEPLAY", "HUD", "ONLINE"]
+    lines = ["; Rainbow Six Siege settings"]
+    for section in sections:
+        lines.append(f"[{section}]")
+        lines.append(f"; {section.lower()} options")
+        for i in range(15):
+            lines.append(f"{section.title()}Option{i}={rng.randint(0, 100)}")
+        if section == "ONLINE":
+            lines.append("DataCenterHint=default")
+        lines.append("")
+    return "\r\n".join(lines) + "\r\n"
+
+
+def legacy_update(file_path: Path, key: str, value: str):
+    """The pre-document update path: full read, linear scan, full write per key"""
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.readlines()
+    for i, line in enumerate(lines):
+        if line.strip().startswith(f'{key}='):
+            lines[i] = f'{key}={value}\n'
+            break
+    else:
+        lines.append(f'{key}={value}\n')
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+
+
+def main():
+    rng = random.Random(1234)
+    sections = ["DISPLAY", "GRAPHICS", "AUDIO", "INPUT", "GAMEPLAY", "HUD"]
+    edits = {"ONLINE": {"DataCenterHint": "playfab/westus"}}
+    # Distinct keys, so every edit is a real one
+    candidates = [(section, f"{section.title()}Option{i}") for section in sections for i in range(15)]
+    for section, key in rng.sample(candidates, EDITS_PER_FILE - 1):
+        edits.setdefault(section, {})[key] = "42"
+    key_count = sum(len(keys) for keys in edits.values())
+
+    print("=" * 60)
+    print(f"GameSettings.ini benchmark: {FILE_COUNT} files, {key_count} keys per file")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        originals = []
+        for i in range(FILE_COUNT):
+            path = root / f"{i:05d}.ini"
+            data = make_settings_text(rng).encode('utf-8')
+            path.write_bytes(data)
+            originals.append((path, data))
+
+        # Parse + serialize only: must be byte-exact
+        start = time.perf_counter()
+        for path, data in originals:
+            assert GameSettingsDocument(data).to_bytes() == data
+        elapsed = time.perf_counter() - start
+        print(f"round trip (in memory): {elapsed:.3f}s  {FILE_COUNT / elapsed:,.0f} files/s  ✓ byte-exact")
+
+        start = time.perf_counter()
+        for path, _ in originals:
+            for keys in edits.values():
+                for key, value in keys.items():
+                    legacy_update(path, key, value)
+        legacy = time.perf_counter() - start
+        print(f"legacy, one key per I/O: {legacy:.3f}s  {FILE_COUNT / legacy:,.0f} files/s")
+
+        for path, data in originals:
+            path.write_bytes(data)
+
+        start = time.perf_counter()
+        for path, _ in originals:
+            update_settings(path, edits)
+        batched = time.perf_counter() - start
+        print(f"document, batched edits: {batched:.3f}s  {FILE_COUNT / batched:,.0f} files/s"
+              f"  ({legacy / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
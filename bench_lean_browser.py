@@ -0,0 +1,155 @@
+"""
+Benchmark for the lean browser profile used by the Ubisoft ID lookup.
+Serves a local stats.cc-like fixture page (search box, heavy images, fonts,
+CSS and a third-party tracker) and compares lookup latency and peak browser
+memory with the lean profile on and off.
+
+Peak memory needs psutil (pip install psutil); latency is always reported.
+"""
+
+import http.server
+import os
+import threading
+import time
+
+from ubisoft_id_fetcher import get_ubisoft_id_from_username
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+FIXTURE_USERNAME = "sauni."
+FIXTURE_ID = "934e0849-2c26-4067-a66a-7636c152d0e5"
+RUNS = 3
+
+FIXTURE_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+  <link rel="stylesheet" href="/static/site.css">
+  <script async src="https://www.googletagmanager.com/gtag/js?id=G-FIXTURE"></script>
+</head>
+<body>
+  <div id="app">
+    <div class="hero"><img src="/static/hero-0.png"><img src="/static/hero-1.jpg"></div>
+    <input placeholder="Search a profile..." oninput="suggest(this.value)">
+    <div id="suggestions"></div>
+    <div class="gallery">%(gallery)s</div>
+  </div>
+  <script>
+    function suggest(q) {
+      setTimeout(function () {
+        document.getElementById('suggestions').innerHTML =
+          '<a href="/siege/other.player/00000000-0000-0000-0000-000000000000">other.player</a>' +
+          '<a href="/siege/%(username)s/%(id)s">%(username)s</a>';
+      }, 300);
+    }
+  </script>
+</body>
+</html>
+"""
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the fixture page and synthetic heavy static assets"""
+
+    def do_GET(self):
+        if self.path.startswith("/siege"):
+            gallery = "".join(f'<img src="/static/tile-{i}.webp">' for i in range(40))
+            body = (FIXTURE_PAGE % {"gallery": gallery, "username": FIXTURE_USERNAME,
+                                    "id": FIXTURE_ID}).encode()
+            content_type = "text/html"
+        elif self.path.endswith(".css"):
+            body = b"@font-face{font-family:f;src:url(/static/font.woff2)} body{font-family:f}"
+            body += b".x{}" * 50_000
+            content_type = "text/css"
+        else:
+            # Images / fonts: sized like real assets, content does not matter
+            body = os.urandom(256 * 1024)
+            content_type = "application/octet-stream"
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def browser_rss_bytes(root_pid: int) -> int:
+    """Total RSS of all processes spawned below root_pid (chromedriver + Chrome)"""
+    try:
+        children = psutil.Process(root_pid).children(recursive=True)
+    except psutil.Error:
+        return 0
+    total = 0
+    for child in children:
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def run_lookup(base_url: str, lean: bool) -> tuple[float, int | None, bool]:
+    """Run one lookup, returning (seconds, peak browser RSS or None, success)"""
+    peak = [0]
+    done = threading.Event()
+
+    def sample():
+        while not done.is_set():
+            peak[0] = max(peak[0], browser_rss_bytes(os.getpid()))
+            done.wait(0.05)
+
+    sampler = None
+    if psutil:
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+
+    start = time.perf_counter()
+    extracted_id, success = get_ubisoft_id_from_username(FIXTURE_USERNAME, lean=lean, base_url=base_url)
+    elapsed = time.perf_counter() - start
+
+    done.set()
+    if sampler:
+        sampler.join()
+
+    return elapsed, (peak[0] if psutil else None), success and extracted_id == FIXTURE_ID
+
+
+def main():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/siege"
+
+    print("=" * 60)
+    print("Lean browser profile benchmark")
+    print("=" * 60)
+
+    try:
+        for lean in (False, True):
+            times = []
+            peaks = []
+            ok = True
+            for _ in range(RUNS):
+                elapsed, peak, success = run_lookup(base_url, lean)
+                times.append(elapsed)
+                if peak is not None:
+                    peaks.append(peak)
+                ok = ok and success
+
+            label = "lean" if lean else "full"
+            best = min(times)
+            mean = sum(times) / len(times)
+            memory = f"{max(peaks) / (1024 * 1024):.1f} MB" if peaks else "n/a (install psutil)"
+            print(f"{label:>5}: best {best:.2f}s  mean {mean:.2f}s  peak browser RSS {memory}"
+                  f"  {'✓' if ok else '✗ lookup failed'}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark for peak memory per pipeline phase.
+Runs discovery, updates and account-table row building over a synthetic
+tree, plus an ID lookup against the local stats.cc fixture (normal and
+low-memory Chrome), and prints one MemoryReport line per phase. Keep the
+output next to a build to spot memory regressions.
+
+Browser and process RSS need psutil (pip install psutil).
+"""
+
+import http.server
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+
+from account_table import AccountEntry
+from bench_lean_browser import FIXTURE_USERNAME, FixtureHandler
+from game_settings_manager import discover_account_settings, read_server_setting, update_server_setting
+from memory_report import MemoryReport, release_browser_processes, trim_process_memory
+from ubisoft_id_fetcher import lookup_ubisoft_id
+
+
+ACCOUNT_COUNT = 2000
+
+
+def main():
+    report = MemoryReport(trace_python=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = Path(tmp) / "Documents"
+        siege_folder = documents / "My Games" / "Rainbow Six - Siege"
+        for _ in range(ACCOUNT_COUNT):
+            folder = siege_folder / str(uuid.uuid4())
+            folder.mkdir(parents=True)
+            (folder / "GameSettings.ini").write_text("[DISPLAY]\nBrightness=50\n\n[ONLINE]\nDataCenterHint=default\n")
+
+        with report.phase("discover"):
+            accounts = discover_account_settings([documents])
+
+        with report.phase("table"):
+            entries = [AccountEntry(account_id, path, read_server_setting(path), path.stat().st_mtime)
+                       for account_id, paths in accounts.items() for path in paths]
+
+        with report.phase("update"):
+            for entry in entries:
+                update_server_setting(entry.file_path, "playfab/westus")
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/siege"
+    try:
+        for name, low_memory in (("resolve", False), ("resolve-lm", True)):
+            with report.phase(name, browser=True):
+                result = lookup_ubisoft_id(FIXTURE_USERNAME, base_url=base_url, low_memory=low_memory)
+            release_browser_processes()
+            if not result.ok:
+                print(f"✗ {name}: {result.error.value}")
+    finally:
+        server.shutdown()
+
+    with report.phase("trim"):
+        trim_process_memory()
+
+    report.close()
+
+    print("=" * 60)
+    print(f"Peak memory per phase ({ACCOUNT_COUNT} accounts)")
+    print("=" * 60)
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark for the server change pipeline.
+Compares the old sequential flow (ID lookup, then filesystem discovery)
+with locate_account_settings, which overlaps the two. Both stages are the
+real code: the lookup runs headless Chrome against the local stats.cc
+fixture from bench_lean_browser, and discovery probes this machine's
+Documents folders (get_user_documents_paths) plus a synthetic account tree.
+Needs Chrome.
+"""
+
+import http.server
+import tempfile
+import threading
+import time
+import uuid
+from functools import partial
+from pathlib import Path
+
+from bench_lean_browser import FIXTURE_ID, FIXTURE_USERNAME, FixtureHandler
+from game_settings_manager import discover_account_settings, get_user_documents_paths
+from server_change_pipeline import locate_account_settings
+from ubisoft_id_fetcher import lookup_ubisoft_id
+
+
+ACCOUNT_COUNT = 2000
+RUNS = 3
+
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return time.perf_counter() - start, result
+
+
+def main():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    resolver = partial(lookup_ubisoft_id, base_url=f"http://127.0.0.1:{server.server_address[1]}/siege")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = Path(tmp) / "Documents"
+        siege_folder = documents / "My Games" / "Rainbow Six - Siege"
+        for account_id in [FIXTURE_ID] + [str(uuid.uuid4()) for _ in range(ACCOUNT_COUNT - 1)]:
+            (siege_folder / account_id).mkdir(parents=True)
+            (siege_folder / account_id / "GameSettings.ini").write_text("[ONLINE]\nDataCenterHint=default\n")
+
+        def discover(token=None):
+            return discover_account_settings(get_user_documents_paths(token) + [documents], token)
+
+        def run_sequential():
+            lookup = resolver(FIXTURE_USERNAME)
+            return lookup, discover().get(lookup.ubisoft_id.lower(), [])
+
+        def run_pipelined():
+            return locate_account_settings(FIXTURE_USERNAME, resolver=resolver, discover=discover)
+
+        print("=" * 60)
+        print(f"Pipeline benchmark: {ACCOUNT_COUNT} synthetic accounts, fixture lookup, {RUNS} runs")
+        print("=" * 60)
+
+        try:
+            lookup_seconds, lookup = timed(lambda: resolver(FIXTURE_USERNAME))
+            if not lookup.ok:
+                print(f"✗ Lookup failed: {lookup.error.value}")
+                return
+            discover_seconds, _ = timed(discover)
+            print(f"lookup alone:    {lookup_seconds:.2f}s")
+            print(f"discovery alone: {discover_seconds:.2f}s")
+
+            sequential = []
+            pipelined = []
+            for _ in range(RUNS):
+                for results, action in ((sequential, run_sequential), (pipelined, run_pipelined)):
+                    seconds, (lookup, files) = timed(action)
+                    assert lookup.ubisoft_id == FIXTURE_ID and files
+                    results.append(seconds)
+
+            print(f"sequential: best {min(sequential):.2f}s  mean {sum(sequential) / RUNS:.2f}s")
+            print(f" pipelined: best {min(pipelined):.2f}s  mean {sum(pipelined) / RUNS:.2f}s"
+                  f"  ({sum(sequential) / RUNS - sum(pipelined) / RUNS:.2f}s saved on average)")
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Module for cancelling long-running lookup and file operations
+"""
+
+import threading
+import time
+from typing import Callable
+
+
+class OperationCancelled(Exception):
+    """Raised when an operation's CancellationToken is cancelled or its deadline passes"""
+
+
+class CancellationToken:
+    """
+    Thread-safe cancel flag with an optional hard deadline
+
+    Workers poll it with raise_if_cancelled() / wait(), and register
+    on_cancel() callbacks to abort blocking work (e.g. quit a browser) the
+    moment Cancel is clicked or the deadline passes.
+    """
+
+    def __init__(self, timeout: float | None = None):
+        """
+        Args:
+            timeout: Seconds until the token cancels itself, or None for no deadline
+        """
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self.deadline_expired = False
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+
+        self._timer = None
+        if timeout is not None:
+            self._timer = threading.Timer(timeout, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _expire(self):
+        self.deadline_expired = True
+        # Already on the timer thread, so the callbacks can run here
+        self._run_callbacks(self._set())
+
+    def cancel(self):
+        """
+        Cancel the operation and run registered callbacks (once)
+
+        The callbacks run on a background thread: tearing down a browser can
+        take seconds, and cancel() is usually called from the UI thread.
+        """
+        callbacks = self._set()
+        if callbacks:
+            threading.Thread(target=self._run_callbacks, args=(callbacks,),
+                             name="cancel-callbacks", daemon=True).start()
+
+    def close(self):
+        """
+        Release the token once its operation has finished
+
+        Stops the deadline timer (so a finished operation is never marked as
+        expired) and drops any callbacks still registered.
+        """
+        if self._timer:
+            self._timer.cancel()
+        with self._lock:
+            self._callbacks = []
+
+    def _set(self) -> list[Callable[[], None]]:
+        """Set the flag; returns the callbacks to run (empty if already cancelled)"""
+        with self._lock:
+            if self._event.is_set():
+                return []
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        if self._timer:
+            self._timer.cancel()
+        return callbacks
+
+    @staticmethod
+    def _run_callbacks(callbacks: list[Callable[[], None]]):
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise OperationCancelled("Deadline reached" if self.deadline_expired else "Cancelled")
+
+    def remaining(self, cap: float | None = None) -> float | None:
+        """
+        Seconds left before the deadline, limited to cap
+
+        Returns:
+            float: min(cap, time left), 0 if cancelled, or None if there is neither a cap nor a deadline
+        """
+        if self._event.is_set():
+            return 0.0
+        if self.deadline is None:
+            return cap
+        left = max(0.0, self.deadline - time.monotonic())
+        return left if cap is None else min(cap, left)
+
+    def wait(self, seconds: float):
+        """Sleep for up to seconds, waking early and raising OperationCancelled on cancel"""
+        self._event.wait(seconds)
+        self.raise_if_cancelled()
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Run callback when the token is cancelled (immediately if it already is)
+
+        Returns:
+            Callable: Call it to unregister the callback
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
@@ -3,15 +3,238 @@ Module to locate and modify GameSettings.ini files for Rainbow Six Siege
 """
 
 import os
+import re
+import shutil
+import tempfile
 from pathlib import Path
-import configparser
 
+from cancellation import CancellationToken, OperationCancelled
 
-def get_user_documents_paths():
+
+SETTINGS_FILENAME = "GameSettings.ini"
+SERVER_SETTING_KEY = "DataCenterHint"
+SERVER_SETTING_SECTION = "ONLINE"
+
+# One physical line including its terminator; the last line may have none
+_LINE_RE = re.compile(r'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+')
+
+
+class GameSettingsDocument:
+    """
+    GameSettings.ini parsed once into a section/key index
+    
+    Only the value part of edited lines is rewritten; comments, ordering,
+    spacing, encoding quirks and line endings of everything else are
+    written back byte-for-byte. As with configparser, a value is the whole
+    rest of the line (stripped): ';' and '#' only start full-line comments.
+    """
+    
+    def __init__(self, data: bytes):
+        # surrogateescape keeps undecodable bytes intact through a round trip
+        text = data.decode('utf-8', errors='surrogateescape')
+        self._lines = _LINE_RE.findall(text)
+        self._newline = self._detect_newline()
+        self._reindex()
+    
+    @classmethod
+    def from_file(cls, file_path: Path) -> 'GameSettingsDocument':
+        with open(file_path, 'rb') as f:
+            return cls(f.read())
+    
+    def to_bytes(self) -> bytes:
+        return ''.join(self._lines).encode('utf-8', errors='surrogateescape')
+    
+    def save(self, file_path: Path):
+        """Write atomically: readers (and the game) see either the old or the new file"""
+        file_path = Path(file_path)
+        fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f'.{file_path.name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.to_bytes())
+            if file_path.exists():
+                shutil.copymode(file_path, tmp_path)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _detect_newline(self) -> str:
+        for line in self._lines:
+            stripped = line.rstrip('\r\n')
+            if stripped != line:
+                return line[len(stripped):]
+        return os.linesep
+    
+    def _reindex(self):
+        """Rebuild the key index and per-section insertion points"""
+        # section -> key -> line index; None is the part before the first header
+        self._keys = {None: {}}
+        # section -> index of the last non-blank line (header included)
+        self._section_ends = {}
+        # Index of the first header line, or None if the file has none
+        self._first_header = None
+        section = None
+        first_occurrence = True
+        
+        for i, line in enumerate(self._lines):
+            stripped = line.strip().lstrip('\ufeff')
+            if not stripped or stripped[0] in ';#':
+                continue
+            if stripped[0] == '[' and ']' in stripped:
+                if self._first_header is None:
+                    self._first_header = i
+                section = stripped[1:stripped.index(']')]
+                # Keys under a repeated header are indexed into the first occurrence
+                first_occurrence = section not in self._keys
+                if first_occurrence:
+                    self._keys[section] = {}
+            elif '=' in stripped:
+                key = stripped.split('=', 1)[0].strip()
+                self._keys[section].setdefault(key, i)
+            else:
+                continue
+            if first_occurrence:
+                self._section_ends[section] = i
+    
+    def sections(self) -> list[str]:
+        """Section names in file order"""
+        return [name for name in self._keys if name is not None]
+    
+    def find_section(self, key: str) -> str | None:
+        """Name of the first section containing key, or None if it is missing"""
+        for section, keys in self._keys.items():
+            if section is not None and key in keys:
+                return section
+        return None
+    
+    def _value_at(self, index: int) -> str:
+        return self._lines[index].split('=', 1)[1].strip()
+    
+    def get(self, key: str, section: str | None = None, default: str | None = None) -> str | None:
+        """
+        Value of key in section, or in the first section that has it if section is None
+        """
+        if section is None:
+            for keys in self._keys.values():
+                if key in keys:
+                    return self._value_at(keys[key])
+            return default
+        index = self._keys.get(section, {}).get(key)
+        return default if index is None else self._value_at(index)
+    
+    def to_dict(self) -> dict[str | None, dict[str, str]]:
+        """All values as {section: {key: value}} (section None holds keys before any header)"""
+        return {section: {key: self._value_at(index) for key, index in keys.items()}
+                for section, keys in self._keys.items() if keys}
+    
+    def set(self, key: str, value: str, section: str | None = None) -> bool:
+        """
+        Set a single key (see update)
+        
+        Returns:
+            bool: True if the document changed
+        """
+        return self.update({section: {key: value}}) > 0
+    
+    def update(self, edits: dict[str | None, dict[str, str]]) -> int:
+        """
+        Apply many edits in one pass
+        
+        Existing keys are rewritten in place. Missing keys are inserted after
+        the last entry of their section, and missing sections are appended at
+        the end of the file. A section of None means "wherever the key already
+        is", falling back to the part before the first header.
+        
+        Args:
+            edits: {section: {key: value}}
+        
+        Returns:
+            int: Number of keys whose value changed or that were added
+        """
+        changed = 0
+        inserts = {}        # insertion line index -> new lines
+        new_sections = {}   # section -> new lines
+        
+        for section, values in edits.items():
+            for key, value in values.items():
+                value = str(value)
+                if section is None:
+                    index = None
+                    for keys in self._keys.values():
+                        if key in keys:
+                            index = keys[key]
+                            break
+                else:
+                    index = self._keys.get(section, {}).get(key)
+                
+                if index is not None:
+                    if self._value_at(index) != value:
+                        self._lines[index] = self._replace_value(self._lines[index], value)
+                        changed += 1
+                    continue
+                
+                new_line = f'{key}={value}{self._newline}'
+                if section is None and self._first_header is not None:
+                    # After the last pre-header entry, or right before the first header
+                    index = self._section_ends[None] + 1 if None in self._section_ends else self._first_header
+                    inserts.setdefault(index, []).append(new_line)
+                elif section is None:
+                    new_sections.setdefault(None, []).append(new_line)
+                elif section in self._section_ends:
+                    inserts.setdefault(self._section_ends[section] + 1, []).append(new_line)
+                else:
+                    new_sections.setdefault(section, []).append(new_line)
+                changed += 1
+        
+        if inserts or new_sections:
+            # Insert from the bottom up so earlier indexes stay valid
+            for index in sorted(inserts, reverse=True):
+                self._ensure_line_ending(index - 1)
+                lines = inserts[index]
+                if index == 0 and self._lines[0].startswith('\ufeff'):
+                    # Keep the BOM at the very start of the file
+                    self._lines[0] = self._lines[0][1:]
+                    lines[0] = '\ufeff' + lines[0]
+                self._lines[index:index] = lines
+            
+            if new_sections:
+                self._ensure_line_ending(len(self._lines) - 1)
+                for section, lines in new_sections.items():
+                    if section is not None:
+                        if self._lines and self._lines[-1].strip():
+                            self._lines.append(self._newline)
+                        self._lines.append(f'[{section}]{self._newline}')
+                    self._lines.extend(lines)
+            
+            self._reindex()
+        
+        return changed
+    
+    def _ensure_line_ending(self, index: int):
+        if 0 <= index < len(self._lines) and not self._lines[index].endswith(('\n', '\r')):
+            self._lines[index] += self._newline
+    
+    @staticmethod
+    def _replace_value(line: str, value: str) -> str:
+        """Swap the value of a key=value line, keeping spacing and line ending"""
+        prefix, rest = line.split('=', 1)
+        body = rest.rstrip('\r\n')
+        padding = body[:len(body) - len(body.lstrip())]
+        trailing = body[len(body.rstrip()):] if body.strip() else ''
+        return f'{prefix}={padding}{value}{trailing}{rest[len(body):]}'
+
+
+def get_user_documents_paths(token: CancellationToken | None = None):
     """
     Get potential paths to Documents folders (regular and OneDrive)
     Searches multiple locations including custom Documents folder locations
     
+    Args:
+        token: Optional cancellation token, checked between drive probes
+    
     Returns:
         list: List of potential Documents paths
     """
@@ -66,6 +289,8 @@ def get_user_documents_paths():
     username = os.getenv('USERNAME') or os.getenv('USER', '')
     
     for drive in "CDEFGHIJKLMNOPQRSTUVWXYZ":
+        if token:
+            token.raise_if_cancelled()
         potential_paths = [
             Path(f"{drive}:/Documents"),  # Direct Documents on drive (like D:/Documents)
         ]
@@ -86,24 +311,27 @@ def get_user_documents_paths():
     return paths
 
 
-def find_game_settings_files(ubisoft_id: str = None):
+def find_game_settings_files(ubisoft_id: str = None, token: CancellationToken | None = None):
     """
     Find GameSettings.ini file(s) for Rainbow Six Siege
     
     Args:
         ubisoft_id: Optional Ubisoft ID to find specific account's file.
                    If None, finds all GameSettings.ini files.
+        token: Optional cancellation token
     
     Returns:
         list: List of Path objects to GameSettings.ini files
     """
     game_settings_files = []
     base_folder_name = "Rainbow Six - Siege"
-    settings_filename = "GameSettings.ini"
+    settings_filename = SETTINGS_FILENAME
     
-    documents_paths = get_user_documents_paths()
+    documents_paths = get_user_documents_paths(token)
     
     for docs_path in documents_paths:
+        if token:
+            token.raise_if_cancelled()
         siege_folder = docs_path / "My Games" / base_folder_name
         
         if not siege_folder.exists():
@@ -127,44 +355,128 @@ def find_game_settings_files(ubisoft_id: str = None):
     return game_settings_files
 
 
-def update_server_setting(file_path: Path, server_value: str) -> bool:
+def iter_account_settings(documents_paths: list[Path] | None = None,
+                          token: CancellationToken | None = None):
+    """
+    Yield (account_folder_name, GameSettings.ini path) as account folders are found
+    
+    Args:
+        documents_paths: Documents folders to scan (defaults to get_user_documents_paths())
+        token: Optional cancellation token
+    
+    Yields:
+        tuple: (account folder name as on disk, Path to GameSettings.ini)
+    """
+    if documents_paths is None:
+        documents_paths = get_user_documents_paths(token)
+    
+    for docs_path in documents_paths:
+        if token:
+            token.raise_if_cancelled()
+        siege_folder = docs_path / "My Games" / "Rainbow Six - Siege"
+        
+        try:
+            entries = list(os.scandir(siege_folder))
+        except OSError:
+            continue
+        
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            settings_file = Path(entry.path) / SETTINGS_FILENAME
+            if settings_file.exists():
+                yield entry.name, settings_file
+
+
+def discover_account_settings(documents_paths: list[Path] | None = None,
+                              token: CancellationToken | None = None) -> dict[str, list[Path]]:
+    """
+    Enumerate every account folder that has a GameSettings.ini
+    
+    Unlike find_game_settings_files this needs no Ubisoft ID, so it can run
+    before (or while) the ID is being looked up.
+    
+    Args:
+        documents_paths: Documents folders to scan (defaults to get_user_documents_paths())
+        token: Optional cancellation token
+    
+    Returns:
+        dict: Lowercase account folder name (Ubisoft ID) -> GameSettings.ini paths
+    """
+    accounts = {}
+    for account_id, settings_file in iter_account_settings(documents_paths, token):
+        accounts.setdefault(account_id.lower(), []).append(settings_file)
+    return accounts
+
+
+def read_server_setting(file_path: Path) -> str | None:
+    """
+    Read only the DataCenterHint value, stopping at the first match
+    
+    Args:
+        file_path: Path to the GameSettings.ini file
+    
+    Returns:
+        str: The current value, or None if the key is missing
+    """
+    key = SERVER_SETTING_KEY.encode()
+    with open(file_path, 'rb') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith(key):
+                name, sep, value = stripped.partition(b'=')
+                if sep and name.strip() == key:
+                    return value.strip().decode('utf-8', errors='replace')
+    return None
+
+
+def update_server_setting(file_path: Path, server_value: str, token: CancellationToken | None = None) -> bool:
     """
     Update the DataCenterHint setting in a GameSettings.ini file
     
+    The file is replaced atomically, so a cancelled run never leaves it half written.
+    
     Args:
         file_path: Path to the GameSettings.ini file
         server_value: Value to set for DataCenterHint (e.g., "default", "playfab/westus1")
+        token: Optional cancellation token, checked right before writing
     
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        # Read the file
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-        
-        # Find and update DataCenterHint line
-        updated = False
-        for i, line in enumerate(lines):
-            if line.strip().startswith('DataCenterHint='):
-                lines[i] = f'DataCenterHint={server_value}\n'
-                updated = True
-                break
-        
-        # If DataCenterHint doesn't exist, add it at the end
-        if not updated:
-            # Remove empty lines at the end
-            while lines and lines[-1].strip() == '':
-                lines.pop()
-            lines.append(f'DataCenterHint={server_value}\n')
-        
-        # Write the file back
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.writelines(lines)
+        doc = GameSettingsDocument.from_file(file_path)
+        
+        # Keep the hint wherever it already is (even before the first header);
+        # otherwise add it to [ONLINE]
+        section = None if doc.get(SERVER_SETTING_KEY) is not None else SERVER_SETTING_SECTION
+        if doc.set(SERVER_SETTING_KEY, server_value, section):
+            if token:
+                token.raise_if_cancelled()
+            doc.save(file_path)
         
         return True
         
+    except OperationCancelled:
+        raise
     except Exception as e:
         print(f"Error updating {file_path}: {e}")
         return False
 
+
+def update_settings(file_path: Path, edits: dict[str | None, dict[str, str]]) -> int:
+    """
+    Apply many key edits to a GameSettings.ini file in one read/write cycle
+    
+    Args:
+        file_path: Path to the GameSettings.ini file
+        edits: {section: {key: value}} (see GameSettingsDocument.update)
+    
+    Returns:
+        int: Number of keys changed; the file is only rewritten if this is > 0
+    """
+    doc = GameSettingsDocument.from_file(file_path)
+    changed = doc.update(edits)
+    if changed:
+        doc.save(file_path)
+    return changed
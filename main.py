@@ -6,19 +6,41 @@ Portable application to change game server for Rainbow Six Siege accounts
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import threading
+import queue
 import os
 import sys
+import time
 from pathlib import Path
-from ubisoft_id_fetcher import get_ubisoft_id_from_username
-from game_settings_manager import find_game_settings_files, update_server_setting
+from account_table import AccountEntry, AccountTable, load_account_labels, save_account_label
+from cancellation import CancellationToken, OperationCancelled
+from memory_report import MemoryReport, release_browser_processes, trim_process_memory
+from game_settings_manager import (discover_account_settings, find_game_settings_files, iter_account_settings,
+                                   read_server_setting, update_server_setting)
+from server_change_pipeline import locate_account_settings
+from settings_guard import ServerSettingGuard
+from ubisoft_id_fetcher import LookupErrorReason, default_resolver, resolve_ubisoft_id
 
 
 
+# How often worker output is flushed to the UI, and how much per flush
+UI_POLL_MS = 50
+UI_BATCH_LIMIT = 2000
+SCAN_BATCH_SIZE = 200
+
+# Log lines kept in the status area (fewer in low-memory mode)
+MAX_LOG_LINES = 2000
+LOW_MEMORY_LOG_LINES = 300
+# Idle time after an operation before low-memory mode trims the process
+IDLE_TRIM_MS = 5000
+# Set SAUNI_TRACE_MEMORY=1 to add the Python heap to the memory report (slows allocation down)
+TRACE_PYTHON_MEMORY = os.getenv('SAUNI_TRACE_MEMORY') == '1'
+
+
 class ServerChangerApp:
     def __init__(self, root):
         self.root = root
         self.root.title("saunis server swapper")
-        self.root.geometry("600x550")
+        self.root.geometry("640x830")
         self.root.resizable(False, False)
         
         # Dark mode color scheme with purple accent
@@ -60,9 +82,27 @@ class ServerChangerApp:
             "Australia": "playfab/australiaeast"
         }
         
+        # Hard deadline for a whole server change (seconds, None = no limit)
+        self.deadline_map = {
+            "No limit": None,
+            "30 s": 30,
+            "60 s": 60,
+            "2 min": 120,
+        }
+        self.cancel_token = None
+        
+        # Worker threads hand UI work (log lines, table rows) to the Tk thread through this queue
+        self.ui_queue = queue.Queue()
+        self.scan_token = None
+        self.guard = None
+        self._trim_job = None
+        
         self.setup_dark_theme()
         self.setup_ui()
         self.setup_text_tags()
+        
+        self.root.after(UI_POLL_MS, self.process_ui_queue)
+        self.root.after(100, self.scan_accounts)
     
     def setup_dark_theme(self):
         """Configure dark theme styles"""
@@ -94,6 +134,17 @@ class ServerChangerApp:
                  background=[('active', self.colors['button_hover']),
                            ('pressed', self.colors['button_active'])],
                  foreground=[('active', 'white')])
+        style.configure('Dark.Treeview', background=self.colors['text_bg'],
+                       fieldbackground=self.colors['text_bg'], foreground=self.colors['text_fg'],
+                       bordercolor=self.colors['border'], borderwidth=0, font=('Consolas', 9))
+        style.map('Dark.Treeview',
+                 background=[('selected', self.colors['accent'])],
+                 foreground=[('selected', 'white')])
+        style.configure('Dark.Treeview.Heading', background=self.colors['frame_bg'],
+                       foreground=self.colors['accent'], borderwidth=0, font=('Consolas', 9, 'bold'))
+        style.map('Dark.Treeview.Heading',
+                 background=[('active', self.colors['entry_bg'])])
+        style.configure('Small.Dark.TButton', padding=4, font=('Consolas', 9, 'bold'))
         style.configure('Dark.TCheckbutton', background=self.colors['bg'],
                        foreground=self.colors['fg'], focuscolor='none')
         style.map('Dark.TCheckbutton',
@@ -163,6 +214,23 @@ class ServerChangerApp:
                                    font=('Consolas', 10))
         server_combo.pack()
         
+        options_frame = tk.Frame(server_frame, bg=self.colors['bg'])
+        options_frame.pack(pady=(10, 0))
+        
+        self.enforce_var = tk.BooleanVar()
+        enforce_checkbox = ttk.Checkbutton(options_frame, text="Enforce (re-apply if reverted)", 
+                                           variable=self.enforce_var,
+                                           command=self.on_enforce_toggle,
+                                           style='Dark.TCheckbutton')
+        enforce_checkbox.pack(side=tk.LEFT, padx=(0, 15))
+        
+        self.low_memory_var = tk.BooleanVar()
+        low_memory_checkbox = ttk.Checkbutton(options_frame, text="Low-memory mode", 
+                                              variable=self.low_memory_var,
+                                              command=self.on_low_memory_toggle,
+                                              style='Dark.TCheckbutton')
+        low_memory_checkbox.pack(side=tk.LEFT)
+        
         # Action button with accent styling
         button_frame = tk.Frame(main_frame, bg=self.colors['bg'])
         button_frame.grid(row=5, column=0, columnspan=2, pady=(0, 20))
@@ -170,7 +238,58 @@ class ServerChangerApp:
         self.change_button = ttk.Button(button_frame, text="Change Server", 
                                         command=self.on_change_server, 
                                         style='Dark.TButton', width=25)
-        self.change_button.pack()
+        self.change_button.pack(side=tk.LEFT)
+        
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", 
+                                        command=self.on_cancel, 
+                                        style='Dark.TButton', width=8, state="disabled")
+        self.cancel_button.pack(side=tk.LEFT, padx=(10, 0))
+        
+        deadline_label = tk.Label(button_frame, text="Time limit", 
+                                  font=('Consolas', 9),
+                                  bg=self.colors['bg'], fg=self.colors['fg'])
+        deadline_label.pack(side=tk.LEFT, padx=(15, 5))
+        
+        self.deadline_var = tk.StringVar(value="No limit")
+        deadline_combo = ttk.Combobox(button_frame, textvariable=self.deadline_var, 
+                                      values=list(self.deadline_map.keys()), 
+                                      state="readonly", width=8, style='Dark.TCombobox',
+                                      font=('Consolas', 10))
+        deadline_combo.pack(side=tk.LEFT)
+        
+        # Account table
+        accounts_frame = tk.LabelFrame(main_frame, text="Accounts", 
+                                       bg=self.colors['bg'], fg=self.colors['accent'],
+                                       font=('Consolas', 9, 'bold'),
+                                       padx=10, pady=10,
+                                       relief=tk.FLAT, bd=1,
+                                       highlightbackground=self.colors['border'],
+                                       highlightthickness=1)
+        accounts_frame.grid(row=6, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 15))
+        
+        accounts_toolbar = tk.Frame(accounts_frame, bg=self.colors['bg'])
+        accounts_toolbar.pack(fill=tk.X, pady=(0, 8))
+        
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add('write', self.on_filter_changed)
+        self._filter_job = None
+        filter_entry = ttk.Entry(accounts_toolbar, textvariable=self.filter_var, 
+                                 style='Dark.TEntry', width=20, font=('Consolas', 10))
+        filter_entry.pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.apply_selected_button = ttk.Button(accounts_toolbar, text="Apply to selected", 
+                                                command=self.on_apply_selected, 
+                                                style='Small.Dark.TButton')
+        self.apply_selected_button.pack(side=tk.RIGHT)
+        ttk.Button(accounts_toolbar, text="Select all", command=lambda: self.account_table.select_all(),
+                   style='Small.Dark.TButton').pack(side=tk.RIGHT, padx=(0, 6))
+        ttk.Button(accounts_toolbar, text="Refresh", command=self.scan_accounts,
+                   style='Small.Dark.TButton').pack(side=tk.RIGHT, padx=(0, 6))
+        
+        self.server_names = {value: name for name, value in self.server_map.items()}
+        self.account_table = AccountTable(accounts_frame, rows=8, server_names=self.server_names,
+                                          style='Dark.Treeview', bg=self.colors['bg'])
+        self.account_table.pack(fill=tk.BOTH, expand=True)
         
         # Status/log area
         log_frame = tk.LabelFrame(main_frame, text="Status Log", 
@@ -180,10 +299,10 @@ class ServerChangerApp:
                                   relief=tk.FLAT, bd=1,
                                   highlightbackground=self.colors['border'],
                                   highlightthickness=1)
-        log_frame.grid(row=6, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        log_frame.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Custom styled text widget
-        self.log_text = scrolledtext.ScrolledText(log_frame, height=12, width=55, 
+        self.log_text = scrolledtext.ScrolledText(log_frame, height=8, width=55, 
                                                   state=tk.DISABLED, wrap=tk.WORD,
                                                   bg=self.colors['text_bg'],
                                                   fg=self.colors['text_fg'],
@@ -198,7 +317,7 @@ class ServerChangerApp:
         
         # Configure grid weights
         main_frame.columnconfigure(0, weight=1)
-        main_frame.rowconfigure(6, weight=1)
+        main_frame.rowconfigure(7, weight=1)
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
     
@@ -221,22 +340,203 @@ class ServerChangerApp:
                      foreground=[('!disabled', self.colors['entry_fg'])])
     
     def log(self, message):
-        """Add message to log area with color coding"""
-        self.log_text.config(state=tk.NORMAL)
+        """Queue a message for the log area (safe to call from any thread)"""
+        self.ui_queue.put(message)
+    
+    def run_on_ui(self, callback):
+        """Run callback on the Tk thread (safe to call from any thread)"""
+        self.ui_queue.put(callback)
+    
+    def show_message(self, show, title, message):
+        """Show a message box on the Tk thread (show is e.g. messagebox.showerror)"""
+        self.run_on_ui(lambda: show(title, message))
+    
+    def process_ui_queue(self):
+        """Drain queued log lines and UI callbacks in one batch"""
+        try:
+            log_changed = False
+            try:
+                for _ in range(UI_BATCH_LIMIT):
+                    item = self.ui_queue.get_nowait()
+                    if callable(item):
+                        item()
+                        continue
+                
+                    if not log_changed:
+                        self.log_text.config(state=tk.NORMAL)
+                        log_changed = True
+                
+                    # Color code messages
+                    if item.startswith("✓") or "SUCCESS" in item:
+                        self.log_text.insert(tk.END, item + "\n", "success")
+                    elif item.startswith("✗") or "ERROR" in item or "FAILED" in item:
+                        self.log_text.insert(tk.END, item + "\n", "error")
+                    elif "=" in item and len(item) > 10:  # Separator lines
+                        self.log_text.insert(tk.END, item + "\n", "separator")
+                    else:
+                        self.log_text.insert(tk.END, item + "\n")
+            except queue.Empty:
+                pass
         
-        # Color code messages
-        if message.startswith("✓") or "SUCCESS" in message:
-            self.log_text.insert(tk.END, message + "\n", "success")
-        elif message.startswith("✗") or "ERROR" in message or "FAILED" in message:
-            self.log_text.insert(tk.END, message + "\n", "error")
-        elif "=" in message and len(message) > 10:  # Separator lines
-            self.log_text.insert(tk.END, message + "\n", "separator")
-        else:
-            self.log_text.insert(tk.END, message + "\n")
+            if log_changed:
+                # Keep the log widget (and its memory) bounded
+                max_lines = LOW_MEMORY_LOG_LINES if self.low_memory_var.get() else MAX_LOG_LINES
+                line_count = int(self.log_text.index('end-1c').split('.')[0])
+                if line_count > max_lines:
+                    self.log_text.delete('1.0', f'{line_count - max_lines + 1}.0')
+                self.log_text.see(tk.END)
+                self.log_text.config(state=tk.DISABLED)
+        finally:
+            # Re-arm even if a queued callback raised, or the UI would stop updating
+            self.root.after(UI_POLL_MS, self.process_ui_queue)
+    
+    def on_filter_changed(self, *args):
+        # Debounce so typing does not refilter thousands of rows per keystroke
+        if self._filter_job:
+            self.root.after_cancel(self._filter_job)
+        self._filter_job = self.root.after(150, lambda: self.account_table.set_filter(self.filter_var.get()))
+    
+    def scan_accounts(self):
+        """(Re)load the account table, streaming rows in as folders are found"""
+        if self.scan_token:
+            self.scan_token.cancel()
+        self.scan_token = CancellationToken()
+        self.account_table.clear()
+        thread = threading.Thread(target=self.scan_accounts_thread, args=(self.scan_token,))
+        thread.daemon = True
+        thread.start()
+    
+    def scan_accounts_thread(self, token):
+        """Thread function feeding discovered accounts to the table in batches"""
+        labels = load_account_labels()
+        batch = []
+        last_flush = time.monotonic()
+        try:
+            for account_id, settings_file in iter_account_settings(token=token):
+                try:
+                    server = read_server_setting(settings_file)
+                    modified = settings_file.stat().st_mtime
+                except OSError:
+                    continue
+                batch.append(AccountEntry(account_id, settings_file, server, modified,
+                                          labels.get(account_id.lower(), "")))
+                if len(batch) >= SCAN_BATCH_SIZE or time.monotonic() - last_flush > 0.1:
+                    self.run_on_ui(lambda rows=batch: self.account_table.add_entries(rows))
+                    batch = []
+                    last_flush = time.monotonic()
+        except OperationCancelled:
+            return
+        if batch:
+            self.run_on_ui(lambda rows=batch: self.account_table.add_entries(rows))
+    
+    def mark_updated(self, file_path, server_value):
+        """Reflect a successful update in the account table"""
+        try:
+            modified = file_path.stat().st_mtime
+        except OSError:
+            modified = time.time()
+        self.run_on_ui(lambda: self.account_table.update_entry(str(file_path), server=server_value,
+                                                               modified=modified))
+    
+    def on_enforce_toggle(self):
+        """Stop guarding when enforce mode is switched off"""
+        if not self.enforce_var.get() and self.guard:
+            self.stop_guard()
+            self.log("Enforce mode off")
+    
+    def on_low_memory_toggle(self):
+        """Switch the lookup browser to the low-memory profile"""
+        default_resolver.lookup_options['low_memory'] = self.low_memory_var.get()
+        if self.low_memory_var.get():
+            self.schedule_idle_trim()
+    
+    def schedule_idle_trim(self):
+        """In low-memory mode, trim the process once it has been idle for a while"""
+        if self._trim_job:
+            self.root.after_cancel(self._trim_job)
+            self._trim_job = None
+        if self.low_memory_var.get():
+            self._trim_job = self.root.after(IDLE_TRIM_MS, self.idle_trim)
+    
+    def idle_trim(self):
+        self._trim_job = None
+        trim_process_memory()
+    
+    def log_memory_report(self, report):
+        """Log peak memory per phase and stop measuring"""
+        report.close()
+        if report.phases:
+            self.log("\nMemory per phase:")
+            for line in report.format().splitlines():
+                self.log("  " + line)
+    
+    def stop_guard(self):
+        if self.guard:
+            self.guard.stop()
+            self.guard = None
+    
+    def start_guard(self, files, server_value):
+        """Keep server_value pinned on files if enforce mode is on (replaces any previous guard)"""
+        self.stop_guard()
+        if not self.enforce_var.get() or not files:
+            return
         
-        self.log_text.see(tk.END)
-        self.log_text.config(state=tk.DISABLED)
-        self.root.update()
+        def on_reapply(file_path, reverted_value):
+            self.log(f"✓ Re-applied {server_value} (game reverted it to {reverted_value}): {file_path}")
+            self.mark_updated(file_path, server_value)
+        
+        self.guard = ServerSettingGuard(files, server_value, on_reapply=on_reapply)
+        self.guard.start()
+        self.log(f"Enforcing {server_value} on {len(files)} file(s) ({self.guard.backend})")
+    
+    def on_apply_selected(self):
+        """Set the selected server on every selected account in the table"""
+        entries = self.account_table.selected_entries()
+        if not entries:
+            messagebox.showwarning("Warning", "Select one or more accounts in the table first.")
+            return
+        
+        # The old pin would fight the new value
+        self.stop_guard()
+        self.change_button.config(state="disabled", text="Processing...")
+        self.apply_selected_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.cancel_token = CancellationToken(self.deadline_map[self.deadline_var.get()])
+        
+        thread = threading.Thread(target=self.apply_selected_thread,
+                                  args=([e.file_path for e in entries], self.server_var.get(), self.cancel_token))
+        thread.daemon = True
+        thread.start()
+    
+    def apply_selected_thread(self, files, selected_server, token):
+        """Thread function updating the accounts selected in the table"""
+        server_value = self.server_map[selected_server]
+        self.log(f"\nUpdating {len(files)} selected account(s) to: {server_value}")
+        updated_files = []
+        try:
+            for file_path in files:
+                token.raise_if_cancelled()
+                if update_server_setting(file_path, server_value, token):
+                    updated_files.append(file_path)
+                    self.mark_updated(file_path, server_value)
+                else:
+                    self.log(f"✗ Failed to update: {file_path}")
+        except OperationCancelled as e:
+            self.log(f"✗ {e}: stopped before finishing")
+        finally:
+            if updated_files:
+                self.log(f"SUCCESS: Updated {len(updated_files)} of {len(files)} file(s)")
+                self.run_on_ui(lambda: self.start_guard(updated_files, server_value))
+            self.run_on_ui(self.finish_operation)
+    
+    def finish_operation(self):
+        if self.cancel_token:
+            # Stop the deadline timer of a run that finished in time
+            self.cancel_token.close()
+        self.schedule_idle_trim()
+        self.cancel_button.config(state="disabled")
+        self.apply_selected_button.config(state="normal")
+        self.change_button.config(state="normal", text="Change Server")
     
     def setup_text_tags(self):
         """Configure text color tags"""
@@ -254,23 +554,39 @@ class ServerChangerApp:
             messagebox.showwarning("Warning", "Please enter a Ubisoft username or select 'Skip' to change all accounts.")
             return
         
-        # Disable button during operation
+        # The old pin would fight the new value
+        self.stop_guard()
+        
+        # Disable buttons during operation
         self.change_button.config(state="disabled")
+        self.apply_selected_button.config(state="disabled")
         self.log_text.config(state=tk.NORMAL)
         self.log_text.delete(1.0, tk.END)
         self.log_text.config(state=tk.DISABLED)
         
         # Update button text to show processing
         self.change_button.config(text="Processing...")
+        self.cancel_button.config(state="normal")
+        self.cancel_token = CancellationToken(self.deadline_map[self.deadline_var.get()])
         
         # Run in separate thread to avoid blocking UI
         thread = threading.Thread(target=self.change_server_thread, 
-                                 args=(username, skip_username, selected_server))
+                                 args=(username, skip_username, selected_server, self.cancel_token))
         thread.daemon = True
         thread.start()
     
-    def change_server_thread(self, username, skip_username, selected_server):
+    def on_cancel(self):
+        """Cancel the running server change"""
+        if self.cancel_token and not self.cancel_token.cancelled:
+            self.cancel_button.config(state="disabled")
+            self.log("\nCancelling...")
+            self.cancel_token.cancel()
+    
+    def change_server_thread(self, username, skip_username, selected_server, token):
         """Thread function to handle server change"""
+        low_memory = self.low_memory_var.get()
+        # Heap tracing would inflate the very heap low-memory mode is bounding
+        report = MemoryReport(trace_python=TRACE_PYTHON_MEMORY and not low_memory)
         try:
             self.log("=" * 50)
             self.log("Starting server change process...")
@@ -283,38 +599,59 @@ class ServerChangerApp:
             if skip_username:
                 self.log("\nSkipping username lookup - will change all accounts")
                 # Find all GameSettings.ini files
-                game_settings_files = find_game_settings_files()
+                with report.phase("discover"):
+                    game_settings_files = find_game_settings_files(token=token)
                 if not game_settings_files:
                     self.log("ERROR: No GameSettings.ini files found!")
-                    messagebox.showerror("Error", "No GameSettings.ini files found in:\n"
-                                                "C:\\Users\\<User>\\Documents\\My Games\\Rainbow Six - Siege\\\n"
-                                                "or\n"
-                                                "C:\\Users\\<User>\\OneDrive\\Documents\\My Games\\Rainbow Six - Siege\\")
-                    self.change_button.config(state="normal")
+                    self.show_message(messagebox.showerror, "Error",
+                                      "No GameSettings.ini files found in:\n"
+                                      "C:\\Users\\<User>\\Documents\\My Games\\Rainbow Six - Siege\\\n"
+                                      "or\n"
+                                      "C:\\Users\\<User>\\OneDrive\\Documents\\My Games\\Rainbow Six - Siege\\")
                     return
                 self.log(f"Found {len(game_settings_files)} GameSettings.ini file(s)")
             else:
                 self.log(f"\nLooking up Ubisoft ID for username: {username}")
-                # Get Ubisoft ID
-                ubisoft_id, success = get_ubisoft_id_from_username(username)
+                # Get Ubisoft ID while account folders are discovered in the background;
+                # both run concurrently, each timed as its own phase (only "resolve"
+                # records browser memory; the process column is shared)
+                def discover(token=None):
+                    with report.phase("discover"):
+                        return discover_account_settings(token=token)
                 
-                if not success or not ubisoft_id:
-                    self.log(f"ERROR: Could not acquire Ubisoft ID for username '{username}'")
-                    messagebox.showerror("Error", f"Could not find Ubisoft ID for username '{username}'.\n"
-                                                 "Please check the username and try again.")
-                    self.change_button.config(state="normal")
+                def resolve(username, token=None):
+                    with report.phase("resolve", browser=True):
+                        return resolve_ubisoft_id(username, token=token)
+                
+                try:
+                    lookup, game_settings_files = locate_account_settings(username, resolver=resolve,
+                                                                          discover=discover, token=token)
+                finally:
+                    if low_memory:
+                        # Make sure nothing of the browser outlives the lookup, even on cancel or error
+                        release_browser_processes()
+                ubisoft_id = lookup.ubisoft_id
+                
+                if not lookup.ok:
+                    self.log(f"ERROR: Could not acquire Ubisoft ID for username '{username}': {lookup.error.value}")
+                    if lookup.error == LookupErrorReason.NOT_FOUND:
+                        hint = "Please check the username and try again."
+                    else:
+                        hint = f"Reason: {lookup.error.value} (after {lookup.attempts} attempt(s)).\nPlease try again later."
+                    self.show_message(messagebox.showerror, "Error",
+                                      f"Could not find Ubisoft ID for username '{username}'.\n{hint}")
                     return
                 
                 self.log(f"✓ Successfully acquired Ubisoft ID: {ubisoft_id}")
+                save_account_label(ubisoft_id, username)
+                self.run_on_ui(lambda: self.account_table.set_label(ubisoft_id, username))
                 
-                # Find GameSettings.ini for this account
-                game_settings_files = find_game_settings_files(ubisoft_id)
                 if not game_settings_files:
                     self.log(f"ERROR: No GameSettings.ini file found for Ubisoft ID: {ubisoft_id}")
-                    messagebox.showerror("Error", f"Could not find GameSettings.ini file for account '{username}'.\n"
-                                                 f"Ubisoft ID: {ubisoft_id}\n\n"
-                                                 "Please ensure the game has been launched at least once.")
-                    self.change_button.config(state="normal")
+                    self.show_message(messagebox.showerror, "Error",
+                                      f"Could not find GameSettings.ini file for account '{username}'.\n"
+                                      f"Ubisoft ID: {ubisoft_id}\n\n"
+                                      "Please ensure the game has been launched at least once.")
                     return
                 self.log(f"✓ Found GameSettings.ini file")
             
@@ -323,30 +660,46 @@ class ServerChangerApp:
             self.log(f"\nUpdating DataCenterHint to: {server_value}")
             
             success_count = 0
-            for file_path in game_settings_files:
-                try:
-                    if update_server_setting(file_path, server_value):
-                        self.log(f"✓ Updated: {file_path}")
-                        success_count += 1
-                    else:
-                        self.log(f"✗ Failed to update: {file_path}")
-                except Exception as e:
-                    self.log(f"✗ Error updating {file_path}: {str(e)}")
+            updated_files = []
+            with report.phase("update"):
+                for file_path in game_settings_files:
+                    token.raise_if_cancelled()
+                    try:
+                        if update_server_setting(file_path, server_value, token):
+                            self.log(f"✓ Updated: {file_path}")
+                            self.mark_updated(file_path, server_value)
+                            updated_files.append(file_path)
+                            success_count += 1
+                        else:
+                            self.log(f"✗ Failed to update: {file_path}")
+                    except OperationCancelled:
+                        raise
+                    except Exception as e:
+                        self.log(f"✗ Error updating {file_path}: {str(e)}")
             
             self.log("\n" + "=" * 50)
             if success_count > 0:
                 self.log(f"SUCCESS: Updated {success_count} file(s)")
-                messagebox.showinfo("Success", f"Successfully updated server setting for {success_count} account(s)!")
+                self.run_on_ui(lambda: self.start_guard(updated_files, server_value))
+                self.show_message(messagebox.showinfo, "Success",
+                                  f"Successfully updated server setting for {success_count} account(s)!")
             else:
                 self.log("FAILED: No files were updated")
-                messagebox.showerror("Error", "Failed to update any GameSettings.ini files.")
+                self.show_message(messagebox.showerror, "Error", "Failed to update any GameSettings.ini files.")
             self.log("=" * 50)
             
+        except OperationCancelled as e:
+            # Files are written atomically, so anything not yet updated is untouched
+            self.log(f"\n✗ {e}: stopped before finishing")
+            if token.deadline_expired:
+                self.show_message(messagebox.showwarning, "Time limit reached",
+                                  "The server change took too long and was stopped.")
         except Exception as e:
             self.log(f"\nERROR: {str(e)}")
-            messagebox.showerror("Error", f"An error occurred:\n{str(e)}")
+            self.show_message(messagebox.showerror, "Error", f"An error occurred:\n{str(e)}")
         finally:
-            self.change_button.config(state="normal", text="Change Server")
+            self.log_memory_report(report)
+            self.run_on_ui(self.finish_operation)
 
 
 def main():
@@ -0,0 +1,199 @@
+"""
+Module to measure and trim the app's memory use
+
+MemoryReport records, per pipeline phase, the peak RSS of this process and
+of its children (chromedriver and Chrome), and optionally the Python heap
+(tracemalloc). RSS needs psutil.
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from ubisoft_id_fetcher import clear_lookup_caches
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+BROWSER_PROCESS_NAMES = ("chrome", "chromedriver")
+
+
+@dataclass
+class PhaseMemory:
+    """Memory use of one phase (bytes; None if it was not measured)"""
+    name: str
+    seconds: float
+    python_current: int | None = None
+    python_peak: int | None = None
+    process_rss_peak: int | None = None
+    children_rss_peak: int | None = None
+
+
+def _rss(process) -> int:
+    try:
+        return process.memory_info().rss
+    except psutil.Error:
+        return 0
+
+
+def _mb(value: int | None) -> str:
+    return "n/a" if value is None else f"{value / (1024 * 1024):.1f} MB"
+
+
+class MemoryReport:
+    """
+    Collects PhaseMemory entries from `with report.phase(name):` blocks
+
+    RSS sampling is cheap and always on. Python heap tracing is opt-in:
+    tracemalloc adds overhead to every allocation while it runs.
+
+    Both tracemalloc and process RSS are process-wide, so phases running at
+    the same time in different threads share the Python peak and the process
+    column. Browser (child process) RSS is only recorded for phases opened
+    with browser=True, so it is not attributed to an overlapping phase.
+    """
+
+    def __init__(self, sample_interval: float = 0.1, trace_python: bool = False):
+        """
+        Args:
+            sample_interval: Seconds between RSS samples while a phase runs
+            trace_python: Also record the Python heap with tracemalloc
+        """
+        self.sample_interval = sample_interval
+        self.trace_python = trace_python
+        self.phases = []
+        self._started_tracing = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str, browser: bool = False):
+        """
+        Measure the enclosed block as one phase
+
+        Args:
+            name: Phase name in the report
+            browser: Also record the RSS of child processes (chromedriver/Chrome)
+        """
+        if self.trace_python:
+            with self._lock:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracing = True
+            tracemalloc.reset_peak()
+
+        peaks = {"process": None, "children": None}
+        done = threading.Event()
+        sampler = None
+        if psutil:
+            me = psutil.Process()
+
+            def sample():
+                while True:
+                    peaks["process"] = max(peaks["process"] or 0, _rss(me))
+                    if browser:
+                        try:
+                            children = me.children(recursive=True)
+                        except psutil.Error:
+                            children = []
+                        peaks["children"] = max(peaks["children"] or 0, sum(_rss(child) for child in children))
+                    if done.wait(self.sample_interval):
+                        return
+
+            sampler = threading.Thread(target=sample, name=f"memory-{name}", daemon=True)
+            sampler.start()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory() if self.trace_python else (None, None)
+            done.set()
+            if sampler:
+                sampler.join()
+            with self._lock:
+                self.phases.append(PhaseMemory(name, seconds, current, peak,
+                                               peaks["process"], peaks["children"]))
+
+    def peak(self, name: str) -> PhaseMemory | None:
+        """Most recent measurement of a phase"""
+        for phase in reversed(self.phases):
+            if phase.name == name:
+                return phase
+        return None
+
+    def format(self) -> str:
+        """One line per phase, for logs and regression tracking"""
+        lines = []
+        for phase in self.phases:
+            lines.append(f"{phase.name:<10} {phase.seconds:6.2f}s  python peak {_mb(phase.python_peak):>9}"
+                         f"  process {_mb(phase.process_rss_peak):>9}"
+                         f"  browser {_mb(phase.children_rss_peak):>9}")
+        return "\n".join(lines)
+
+    def close(self):
+        """Stop tracemalloc if this report started it (tracing slows allocation down)"""
+        with self._lock:
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+
+def release_browser_processes() -> int:
+    """
+    Kill chromedriver/Chrome processes left behind by this app
+
+    driver.quit() normally takes them down; this is the safety net for low-memory
+    mode after a crashed or cancelled session.
+
+    Returns:
+        int: Number of processes killed (0 without psutil)
+    """
+    if psutil is None:
+        return 0
+    killed = 0
+    try:
+        children = psutil.Process().children(recursive=True)
+    except psutil.Error:
+        return 0
+    for child in children:
+        try:
+            if child.name().lower().startswith(BROWSER_PROCESS_NAMES):
+                child.kill()
+                killed += 1
+        except psutil.Error:
+            pass
+    return killed
+
+
+def trim_process_memory():
+    """
+    Drop caches and hand free memory back to the OS
+
+    Clears the lookup regex caches, runs a full GC, then asks the OS to trim the
+    working set (Windows) or the C heap (glibc).
+    """
+    clear_lookup_caches()
+    re.purge()
+    gc.collect()
+
+    try:
+        if sys.platform == 'win32':
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetProcessWorkingSetSize(kernel32.GetCurrentProcess(), ctypes.c_size_t(-1),
+                                              ctypes.c_size_t(-1))
+        elif sys.platform.startswith('linux'):
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6')
+            libc.malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
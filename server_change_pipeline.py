@@ -0,0 +1,70 @@
+"""
+Module to locate an account's GameSettings.ini with ID lookup and
+filesystem discovery running concurrently
+"""
+
+import threading
+from pathlib import Path
+from typing import Callable
+
+from cancellation import CancellationToken
+from game_settings_manager import discover_account_settings
+from ubisoft_id_fetcher import LookupResult, resolve_ubisoft_id
+
+
+def locate_account_settings(
+    username: str,
+    resolver: Callable[..., LookupResult] = resolve_ubisoft_id,
+    discover: Callable[..., dict[str, list[Path]]] = discover_account_settings,
+    token: CancellationToken | None = None,
+) -> tuple[LookupResult, list[Path]]:
+    """
+    Resolve a username to its Ubisoft ID and GameSettings.ini file(s)
+
+    Discovery of all account folders starts immediately and runs while the
+    browser lookup is in progress; the final match is a dict lookup of the
+    resolved ID against the already-discovered folders.
+
+    Args:
+        username: The Ubisoft username to look up
+        resolver: (username, token=...) -> LookupResult
+        discover: (token=...) -> {lowercase ubisoft_id: [GameSettings.ini paths]}
+        token: Optional cancellation token for the lookup; discovery runs on a
+               child token that is also cancelled once the lookup fails
+
+    Returns:
+        tuple: (lookup, files). lookup.error says why resolution failed;
+               files is empty if no folder exists for the account.
+
+    Raises:
+        OperationCancelled: If token was cancelled or its deadline passed
+    """
+    # Discovery gets its own token so a failed lookup can stop it early;
+    # cancelling the caller's token stops it too
+    discovery_token = CancellationToken()
+    unlink = token.on_cancel(discovery_token.cancel) if token else None
+    outcome = {}
+
+    def run_discovery():
+        try:
+            outcome["accounts"] = discover(token=discovery_token)
+        except BaseException as e:
+            outcome["error"] = e
+
+    # Daemon, so closing the app never waits for a slow drive probe
+    discovery = threading.Thread(target=run_discovery, name="server-change-discovery", daemon=True)
+    discovery.start()
+    try:
+        lookup = resolver(username, token=token)
+        if not lookup.ok:
+            return lookup, []
+
+        discovery.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        return lookup, outcome["accounts"].get(lookup.ubisoft_id.lower(), [])
+    finally:
+        # No-op once discovery has finished; otherwise stops a discovery we no longer need
+        discovery_token.cancel()
+        if unlink:
+            unlink()
@@ -0,0 +1,239 @@
+"""
+Module to keep DataCenterHint pinned while the game is running
+
+The game can rewrite GameSettings.ini on exit, reverting the server choice.
+ServerSettingGuard watches the chosen files and puts the pinned value back
+after each burst of writes. On Linux it blocks on inotify (no CPU while
+idle); elsewhere it polls mtimes, backing off while nothing changes.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable
+
+from game_settings_manager import read_server_setting, update_server_setting
+
+
+# inotify(7) constants
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+
+def _load_inotify():
+    """libc with inotify support, or None if unavailable"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class _InotifyWatcher:
+    """Blocks until one of the files is written or replaced"""
+
+    def __init__(self, libc, files: list[Path]):
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._stop_r, self._stop_w = os.pipe()
+
+        # Watch parent folders: saving via rename replaces the file's inode
+        self._names = {}  # wd -> {file name: Path}
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        for file_path in files:
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(file_path.parent), mask)
+            if wd < 0:
+                self.close()
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {file_path.parent}")
+            self._names.setdefault(wd, {})[file_path.name] = file_path
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        """Changed files, or an empty set on timeout or stop"""
+        ready, _, _ = select.select([self._fd, self._stop_r], [], [], timeout)
+        if self._fd not in ready:
+            return set()
+
+        changed = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            file_path = self._names.get(wd, {}).get(os.fsdecode(name))
+            if file_path:
+                changed.add(file_path)
+        return changed
+
+    def wake(self):
+        os.write(self._stop_w, b'x')
+
+    def close(self):
+        for fd in (self._fd, self._stop_r, self._stop_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class _PollWatcher:
+    """Compares mtimes, doubling the poll interval while nothing changes"""
+
+    def __init__(self, files: list[Path], min_interval: float, max_interval: float):
+        self._files = files
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._interval = min_interval
+        self._stop = threading.Event()
+        self._stamps = {file_path: self._stamp(file_path) for file_path in files}
+
+    @staticmethod
+    def _stamp(file_path: Path):
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        """Changed files, or an empty set on timeout or stop"""
+        waited = 0.0
+        while not self._stop.is_set():
+            interval = self._interval if timeout is None else min(self._interval, timeout - waited)
+            if interval <= 0 or self._stop.wait(interval):
+                return set()
+            waited += interval
+
+            changed = set()
+            for file_path in self._files:
+                stamp = self._stamp(file_path)
+                if stamp != self._stamps[file_path]:
+                    self._stamps[file_path] = stamp
+                    changed.add(file_path)
+            if changed:
+                self._interval = self._min_interval
+                return changed
+            self._interval = min(self._max_interval, self._interval * 2)
+        return set()
+
+    def wake(self):
+        self._stop.set()
+
+    def close(self):
+        pass
+
+
+class ServerSettingGuard:
+    """
+    Re-applies a pinned DataCenterHint when something else changes it
+    """
+
+    def __init__(self, files: list[Path], server_value: str,
+                 on_reapply: Callable[[Path, str | None], None] | None = None,
+                 debounce: float = 1.0, min_poll_interval: float = 1.0, max_poll_interval: float = 10.0,
+                 use_inotify: bool = True):
+        """
+        Args:
+            files: GameSettings.ini files to guard
+            server_value: DataCenterHint value to keep
+            on_reapply: Called as on_reapply(file_path, reverted_value) after each fix
+            debounce: Quiet time after the last write before the file is checked
+            min_poll_interval: Fastest mtime poll (fallback watcher only)
+            max_poll_interval: Slowest mtime poll once idle (fallback watcher only)
+            use_inotify: Use inotify where available
+        """
+        self.files = [Path(p) for p in files]
+        self.server_value = server_value
+        self.on_reapply = on_reapply
+        self.debounce = debounce
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.use_inotify = use_inotify
+        self.backend = None
+        self._watcher = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start watching in a background thread"""
+        if self.running:
+            return
+        self._stopping.clear()
+
+        libc = _load_inotify() if self.use_inotify else None
+        self._watcher = None
+        if libc:
+            try:
+                self._watcher = _InotifyWatcher(libc, self.files)
+                self.backend = "inotify"
+            except OSError:
+                self._watcher = None
+        if self._watcher is None:
+            self._watcher = _PollWatcher(self.files, self.min_poll_interval, self.max_poll_interval)
+            self.backend = "poll"
+
+        self._thread = threading.Thread(target=self._run, name="server-setting-guard", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching and wait for the thread to exit"""
+        self._stopping.set()
+        if self._watcher:
+            self._watcher.wake()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._watcher:
+            self._watcher.close()
+        self._thread = None
+        self._watcher = None
+
+    def _run(self):
+        # Catch anything that reverted the value before we started watching;
+        # done here so start() never does per-file I/O on the caller's (UI) thread
+        self._reapply(set(self.files))
+        while not self._stopping.is_set():
+            changed = self._watcher.wait(None)
+            if not changed:
+                continue
+            # Let the write burst settle before reading
+            while not self._stopping.is_set():
+                more = self._watcher.wait(self.debounce)
+                if not more:
+                    break
+                changed |= more
+            if not self._stopping.is_set():
+                self._reapply(changed)
+
+    def _reapply(self, files: set[Path]):
+        for file_path in files:
+            if self._stopping.is_set():
+                return
+            try:
+                current = read_server_setting(file_path)
+            except OSError:
+                continue
+            if current != self.server_value and update_server_setting(file_path, self.server_value):
+                if self.on_reapply:
+                    self.on_reapply(file_path, current)
@@ -0,0 +1,177 @@
+"""
+Module to mirror one account's GameSettings.ini onto other accounts
+"""
+
+import argparse
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from game_settings_manager import GameSettingsDocument, find_game_settings_files
+
+
+SYNC_UPDATED = "updated"
+SYNC_IN_SYNC = "in sync"
+SYNC_ERROR = "error"
+
+
+@dataclass
+class SyncResult:
+    """Outcome of syncing one target account"""
+    file_path: Path
+    status: str
+    # (section, key) -> (old value or None if missing, new value)
+    changes: dict = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def account_id(self) -> str:
+        return self.file_path.parent.name
+
+
+def key_selected(section: str | None, key: str,
+                 include: list[str] | None = None, exclude: list[str] | None = None) -> bool:
+    """
+    Check a key against include/exclude lists
+
+    Patterns are shell-style and match either the bare key ("DataCenterHint")
+    or "SECTION/key" ("AUDIO/*"). Exclude wins over include; no include list
+    means every key is included.
+    """
+    names = (key, f"{section}/{key}")
+
+    def matches(patterns):
+        return any(fnmatchcase(name, pattern) for pattern in patterns for name in names)
+
+    if exclude and matches(exclude):
+        return False
+    return not include or matches(include)
+
+
+def compute_delta(source_values: dict, target: GameSettingsDocument,
+                  include: list[str] | None = None, exclude: list[str] | None = None) -> dict:
+    """
+    Key-level diff of source values against a target document
+
+    Args:
+        source_values: Source settings as returned by GameSettingsDocument.to_dict()
+        target: Target document
+        include: Optional include patterns (see key_selected)
+        exclude: Optional exclude patterns (see key_selected)
+
+    Returns:
+        dict: (section, key) -> (target value or None, source value) for differing keys
+    """
+    target_values = target.to_dict()
+    delta = {}
+    for section, keys in source_values.items():
+        target_keys = target_values.get(section, {})
+        for key, value in keys.items():
+            if not key_selected(section, key, include, exclude):
+                continue
+            old = target_keys.get(key)
+            if old != value:
+                delta[(section, key)] = (old, value)
+    return delta
+
+
+def _sync_target(source_bytes: bytes, source_hash: str, source_values: dict, target_file: Path,
+                 include: list[str] | None, exclude: list[str] | None, dry_run: bool) -> SyncResult:
+    try:
+        with open(target_file, 'rb') as f:
+            target_bytes = f.read()
+
+        # Identical files need no parsing at all
+        if hashlib.sha256(target_bytes).hexdigest() == source_hash:
+            return SyncResult(target_file, SYNC_IN_SYNC)
+
+        target = GameSettingsDocument(target_bytes)
+        delta = compute_delta(source_values, target, include, exclude)
+        if not delta:
+            return SyncResult(target_file, SYNC_IN_SYNC)
+
+        if not dry_run:
+            edits = {}
+            for (section, key), (_, value) in delta.items():
+                edits.setdefault(section, {})[key] = value
+            target.update(edits)
+            target.save(target_file)
+
+        return SyncResult(target_file, SYNC_UPDATED, delta)
+
+    except Exception as e:
+        return SyncResult(target_file, SYNC_ERROR, error=str(e))
+
+
+def sync_settings(source_file: Path, target_files: list[Path] | None = None,
+                  include: list[str] | None = None, exclude: list[str] | None = None,
+                  dry_run: bool = False, max_workers: int = 8) -> list[SyncResult]:
+    """
+    Mirror settings from one GameSettings.ini onto other accounts
+
+    Only keys that differ are written, and targets that already match are
+    left untouched. Targets are processed in parallel.
+
+    Args:
+        source_file: The "golden" account's GameSettings.ini
+        target_files: Files to update (defaults to every other discovered account)
+        include: Optional include patterns (see key_selected)
+        exclude: Optional exclude patterns (see key_selected)
+        dry_run: If True, report deltas without writing
+        max_workers: Maximum number of targets processed at once
+
+    Returns:
+        list: One SyncResult per target, in target order
+    """
+    source_file = Path(source_file)
+    with open(source_file, 'rb') as f:
+        source_bytes = f.read()
+    source_hash = hashlib.sha256(source_bytes).hexdigest()
+    source_values = GameSettingsDocument(source_bytes).to_dict()
+
+    if target_files is None:
+        target_files = find_game_settings_files()
+    source_resolved = source_file.resolve()
+    target_files = [Path(p) for p in target_files if Path(p).resolve() != source_resolved]
+
+    if not target_files:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(target_files))) as executor:
+        return list(executor.map(
+            lambda target: _sync_target(source_bytes, source_hash, source_values, target,
+                                        include, exclude, dry_run),
+            target_files,
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror one account's GameSettings.ini to all other accounts")
+    parser.add_argument("source_id", help="Ubisoft ID of the account to copy settings from")
+    parser.add_argument("--include", nargs="*", help="Only sync these keys (KEY or SECTION/KEY, wildcards allowed)")
+    parser.add_argument("--exclude", nargs="*", help="Never sync these keys")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would change without writing")
+    args = parser.parse_args()
+
+    sources = find_game_settings_files(args.source_id)
+    if not sources:
+        print(f"✗ No GameSettings.ini found for Ubisoft ID: {args.source_id}")
+        return 1
+
+    results = sync_settings(sources[0], include=args.include, exclude=args.exclude, dry_run=args.dry_run)
+    for result in results:
+        if result.status == SYNC_ERROR:
+            print(f"✗ {result.account_id}: {result.error}")
+        elif result.status == SYNC_IN_SYNC:
+            print(f"✓ {result.account_id}: already in sync")
+        else:
+            print(f"✓ {result.account_id}: {len(result.changes)} key(s)")
+            for (section, key), (old, new) in result.changes.items():
+                print(f"    [{section}] {key}: {old} -> {new}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+"""
+Tests for the account scan and the virtualized account table model
+"""
+
+from pathlib import Path
+
+import pytest
+
+from account_table import AccountEntry, AccountTable
+from game_settings_manager import iter_account_settings, read_server_setting
+
+
+def entry(index: int, server: str | None = "playfab/westus", label: str = "") -> AccountEntry:
+    return AccountEntry(f"{index:08d}-0000-0000-0000-000000000000", Path(f"docs/{index}/GameSettings.ini"),
+                        server, 0.0, label)
+
+
+@pytest.fixture
+def table():
+    tk = pytest.importorskip("tkinter")
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"no display: {e}")
+    root.withdraw()
+    table = AccountTable(root, rows=4)
+    yield table
+    root.destroy()
+
+
+def test_iter_account_settings_yields_only_folders_with_settings(tmp_path):
+    siege_folder = tmp_path / "Documents" / "My Games" / "Rainbow Six - Siege"
+    (siege_folder / "ABC-123").mkdir(parents=True)
+    (siege_folder / "ABC-123" / "GameSettings.ini").write_text("[ONLINE]\nDataCenterHint=default\n")
+    (siege_folder / "no-settings").mkdir()
+    (siege_folder / "stray.txt").write_text("")
+
+    found = list(iter_account_settings([tmp_path / "Documents", tmp_path / "missing"]))
+
+    assert found == [("ABC-123", siege_folder / "ABC-123" / "GameSettings.ini")]
+
+
+def test_read_server_setting(tmp_path):
+    settings_file = tmp_path / "GameSettings.ini"
+    settings_file.write_bytes(b"[ONLINE]\r\nDataCenterHintOld=x\r\n  DataCenterHint = playfab/westus \r\n")
+    assert read_server_setting(settings_file) == "playfab/westus"
+
+    settings_file.write_bytes(b"[ONLINE]\r\nRegion=eu\r\n")
+    assert read_server_setting(settings_file) is None
+
+
+def test_add_entries_refreshes_existing_accounts(table):
+    table.add_entries([entry(0), entry(1)])
+    table.add_entries([entry(1, "playfab/eastus"), entry(2)])
+
+    assert len(table) == 3
+    assert [e.server for e in table.selected_entries()] == []
+    table.select_all()
+    assert [e.server for e in table.selected_entries()] == ["playfab/westus", "playfab/eastus", "playfab/westus"]
+
+
+def test_selection_survives_scrolling_and_filtering(table):
+    table.add_entries([entry(i, "playfab/westus" if i % 2 else "default") for i in range(10)])
+    table.update()
+    table.tree.selection_set([table._row_ids[1]])
+    table._on_tree_select()
+
+    table.scroll(6)
+    table.update()
+    table.set_filter("westus")
+    table.update()
+
+    assert table.visible_count == 5
+    assert [e.account_id for e in table.selected_entries()] == [entry(1).account_id]
+    table.set_filter("")
+    assert [e.account_id for e in table.selected_entries()] == [entry(1).account_id]
+
+
+def test_changed_entries_are_refiltered(table):
+    table.add_entries([entry(i) for i in range(3)])
+    table.set_filter("westus")
+
+    table.update_entry(entry(1).key, server="playfab/eastus")
+    table.select_all()
+    assert [e.account_id for e in table.selected_entries()] == [entry(0).account_id, entry(2).account_id]
+
+    table.update_entry(entry(1).key, server="playfab/westus")
+    table.add_entries([entry(0, "default")])
+    table.select_all()
+    assert [e.account_id for e in table.selected_entries()] == [entry(1).account_id, entry(2).account_id]
+
+    table.set_filter("main")
+    table.set_label(entry(2).account_id, "Main")
+    assert [e.label for e in table.selected_entries()] == ["Main"]
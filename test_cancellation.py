@@ -0,0 +1,83 @@
+"""
+Tests for cancellation tokens and cancel-safe settings writes
+"""
+
+import threading
+import time
+
+import pytest
+
+from cancellation import CancellationToken, OperationCancelled
+from game_settings_manager import update_server_setting
+
+
+def test_deadline_cancels_and_runs_callbacks():
+    token = CancellationToken(timeout=0.05)
+    torn_down = []
+    token.on_cancel(lambda: torn_down.append(True))
+
+    start = time.monotonic()
+    with pytest.raises(OperationCancelled, match="Deadline"):
+        token.wait(5)
+
+    assert time.monotonic() - start < 1
+    assert token.deadline_expired
+    assert torn_down == [True]
+    assert token.remaining(15) == 0
+
+
+def test_cancel_does_not_wait_for_slow_teardown():
+    token = CancellationToken()
+    release = threading.Event()
+    torn_down = threading.Event()
+
+    def slow_quit():
+        release.wait(5)
+        torn_down.set()
+
+    token.on_cancel(slow_quit)
+    start = time.monotonic()
+    token.cancel()
+
+    assert time.monotonic() - start < 0.5
+    assert token.cancelled
+    release.set()
+    assert torn_down.wait(5)
+
+
+def test_closed_token_never_expires():
+    token = CancellationToken(timeout=0.05)
+    torn_down = []
+    token.on_cancel(lambda: torn_down.append(True))
+
+    token.close()
+    time.sleep(0.15)
+
+    assert not token.cancelled
+    assert not token.deadline_expired
+    assert torn_down == []
+
+
+def test_unregistered_callback_is_not_run():
+    token = CancellationToken()
+    calls = []
+    unregister = token.on_cancel(lambda: calls.append("quit"))
+
+    unregister()
+    token.cancel()
+
+    assert calls == []
+    assert token.remaining(15) == 0
+
+
+def test_cancelled_update_leaves_file_untouched(tmp_path):
+    settings_file = tmp_path / "GameSettings.ini"
+    settings_file.write_bytes(b"[ONLINE]\r\nDataCenterHint=default\r\n")
+    token = CancellationToken()
+    token.cancel()
+
+    with pytest.raises(OperationCancelled):
+        update_server_setting(settings_file, "playfab/westus", token)
+
+    assert settings_file.read_bytes() == b"[ONLINE]\r\nDataCenterHint=default\r\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["GameSettings.ini"]
@@ -0,0 +1,88 @@
+"""
+Tests for the round-trip GameSettings.ini document model
+"""
+
+from game_settings_manager import GameSettingsDocument, read_server_setting, update_server_setting
+
+
+SAMPLE = (
+    b"\xef\xbb\xbf; GameSettings.ini\r\n"
+    b"[DISPLAY]\r\n"
+    b"Brightness = 50\r\n"
+    b"ResolutionWidth=1920\r\n"
+    b"\r\n"
+    b"; audio settings follow\r\n"
+    b"[AUDIO]\r\n"
+    b"Volume=80\t\r\n"
+    b"\r\n"
+    b"[ONLINE]\r\n"
+    b"DataCenterHint=default\r\n"
+    b"Name=\xff\xfe raw"
+)
+
+
+def test_round_trip_is_byte_exact():
+    assert GameSettingsDocument(SAMPLE).to_bytes() == SAMPLE
+
+
+def test_batched_edit_rewrites_only_values():
+    doc = GameSettingsDocument(SAMPLE)
+
+    changed = doc.update({
+        "DISPLAY": {"Brightness": "60", "ResolutionWidth": "1920"},
+        "ONLINE": {"DataCenterHint": "playfab/westus"},
+    })
+
+    assert changed == 2
+    expected = (SAMPLE
+                .replace(b"Brightness = 50", b"Brightness = 60")
+                .replace(b"DataCenterHint=default", b"DataCenterHint=playfab/westus"))
+    assert doc.to_bytes() == expected
+    assert doc.get("Brightness") == "60"
+
+
+def test_missing_key_is_inserted_into_its_section():
+    doc = GameSettingsDocument(SAMPLE)
+
+    doc.update({"AUDIO": {"Music": "20"}, "GAMEPLAY": {"FOV": "90"}})
+
+    out = doc.to_bytes()
+    assert b"Volume=80\t\r\nMusic=20\r\n\r\n[ONLINE]" in out
+    assert out.endswith(b"Name=\xff\xfe raw\r\n\r\n[GAMEPLAY]\r\nFOV=90\r\n")
+    assert doc.get("Music", "AUDIO") == "20"
+    assert doc.sections() == ["DISPLAY", "AUDIO", "ONLINE", "GAMEPLAY"]
+
+
+def test_update_server_setting_adds_hint_to_online_section(tmp_path):
+    settings_file = tmp_path / "GameSettings.ini"
+    settings_file.write_bytes(b"[ONLINE]\nRegion=eu\n\n[AUDIO]\nVolume=80\n")
+
+    assert update_server_setting(settings_file, "playfab/eastus")
+
+    assert settings_file.read_bytes() == (
+        b"[ONLINE]\nRegion=eu\nDataCenterHint=playfab/eastus\n\n[AUDIO]\nVolume=80\n"
+    )
+
+
+def test_hint_before_first_header_is_edited_in_place(tmp_path):
+    settings_file = tmp_path / "GameSettings.ini"
+    settings_file.write_bytes(b"DataCenterHint=default\n[ONLINE]\nA=1\n")
+
+    assert update_server_setting(settings_file, "playfab/westus")
+
+    assert settings_file.read_bytes() == b"DataCenterHint=playfab/westus\n[ONLINE]\nA=1\n"
+
+
+def test_value_with_comment_characters_is_kept_whole(tmp_path):
+    settings_file = tmp_path / "GameSettings.ini"
+    data = b"[ONLINE]\r\nDataCenterHint = default ;launcher\r\nName=Team #1\r\n"
+    settings_file.write_bytes(data)
+    doc = GameSettingsDocument.from_file(settings_file)
+
+    assert doc.to_bytes() == data
+    assert doc.get("DataCenterHint") == "default ;launcher"
+    assert read_server_setting(settings_file) == "default ;launcher"
+    assert doc.get("Name") == "Team #1"
+
+    assert doc.set("Name", "Team #2")
+    assert doc.to_bytes() == data.replace(b"Team #1", b"Team #2")
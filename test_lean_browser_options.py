@@ -0,0 +1,58 @@
+"""
+Tests for the lean and low-memory Chrome profiles used by the ID lookup
+"""
+
+import ubisoft_id_fetcher
+from ubisoft_id_fetcher import (
+    LEAN_BLOCKED_URL_PATTERNS,
+    LOW_MEMORY_ARGUMENTS,
+    build_chrome_options,
+    create_driver,
+)
+
+
+class FakeChrome:
+    """Records DevTools commands instead of starting Chrome"""
+
+    def __init__(self, options):
+        self.options = options
+        self.cdp_commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp_commands.append((command, params))
+
+
+def test_lean_profile_options():
+    options = build_chrome_options(lean=True)
+
+    assert options.page_load_strategy == 'eager'
+    assert '--headless' in options.arguments
+    assert '--window-size=800,600' in options.arguments
+    assert '--disable-extensions' in options.arguments
+    assert options.experimental_options['prefs'] == {'profile.managed_default_content_settings.images': 2}
+    assert not set(LOW_MEMORY_ARGUMENTS) & set(options.arguments)
+
+
+def test_full_profile_keeps_baseline_options():
+    options = build_chrome_options(lean=False, low_memory=True)
+
+    assert options.page_load_strategy == 'normal'
+    assert options.arguments[:4] == ['--headless', '--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu']
+    assert '--disable-extensions' not in options.arguments
+    assert 'prefs' not in options.experimental_options
+    assert options.arguments[4:] == LOW_MEMORY_ARGUMENTS
+
+
+def test_create_driver_blocks_non_essential_urls(monkeypatch):
+    monkeypatch.setattr(ubisoft_id_fetcher.webdriver, 'Chrome', FakeChrome)
+
+    driver = create_driver(lean=True)
+    assert driver.cdp_commands == [
+        ('Network.enable', {}),
+        ('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URL_PATTERNS}),
+    ]
+    assert '*.css' in LEAN_BLOCKED_URL_PATTERNS and '*.woff2' in LEAN_BLOCKED_URL_PATTERNS
+
+    assert create_driver(lean=True, blocked_url_patterns=['*.png']).cdp_commands[1] == (
+        'Network.setBlockedURLs', {'urls': ['*.png']})
+    assert create_driver(lean=False).cdp_commands == []
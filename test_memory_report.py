@@ -0,0 +1,58 @@
+"""
+Tests for per-phase memory reporting
+"""
+
+import tracemalloc
+
+from memory_report import MemoryReport, psutil, trim_process_memory
+
+
+def test_phase_records_python_peak_and_stops_tracing():
+    assert not tracemalloc.is_tracing()
+    report = MemoryReport(sample_interval=0.01, trace_python=True)
+
+    with report.phase("small"):
+        data = bytearray(64 * 1024)
+    with report.phase("large"):
+        data = bytearray(8 * 1024 * 1024)
+        del data
+
+    report.close()
+
+    assert [p.name for p in report.phases] == ["small", "large"]
+    assert report.peak("large").python_peak >= 8 * 1024 * 1024
+    assert report.peak("small").python_peak < 8 * 1024 * 1024
+    assert "large" in report.format()
+    assert not tracemalloc.is_tracing()
+
+
+def test_python_tracing_is_off_by_default():
+    report = MemoryReport(sample_interval=0.01)
+
+    with report.phase("resolve"):
+        assert not tracemalloc.is_tracing()
+
+    report.close()
+
+    assert report.peak("resolve").python_peak is None
+    assert "python peak       n/a" in report.format()
+
+
+def test_trim_process_memory_is_safe_to_call():
+    trim_process_memory()
+
+
+def test_browser_memory_is_only_recorded_for_browser_phases():
+    report = MemoryReport(sample_interval=0.01)
+
+    with report.phase("discover"):
+        pass
+    with report.phase("resolve", browser=True):
+        pass
+
+    report.close()
+
+    assert report.peak("discover").children_rss_peak is None
+    if psutil:
+        assert report.peak("resolve").children_rss_peak is not None
+        assert report.peak("discover").process_rss_peak is not None
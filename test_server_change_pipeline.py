@@ -0,0 +1,57 @@
+"""
+Tests for overlapping ID lookup with account folder discovery
+"""
+
+import threading
+import time
+from pathlib import Path
+
+from cancellation import OperationCancelled
+from server_change_pipeline import locate_account_settings
+from ubisoft_id_fetcher import LookupErrorReason, LookupResult
+
+
+def test_discovery_runs_while_lookup_is_in_progress():
+    discovery_started = threading.Event()
+    settings_file = Path("docs/934e0849-2c26-4067-a66a-7636c152d0e5/GameSettings.ini")
+
+    def discover(token=None):
+        discovery_started.set()
+        return {"934e0849-2c26-4067-a66a-7636c152d0e5": [settings_file]}
+
+    def resolver(username, token=None):
+        # Only returns once discovery is underway, so a sequential pipeline would time out
+        assert discovery_started.wait(5)
+        return LookupResult("934E0849-2C26-4067-A66A-7636C152D0E5")
+
+    lookup, files = locate_account_settings("sauni.", resolver=resolver, discover=discover)
+
+    assert lookup.ubisoft_id == "934E0849-2C26-4067-A66A-7636C152D0E5"
+    assert files == [settings_file]
+
+
+def test_failed_lookup_reports_reason():
+    failed = LookupResult(error=LookupErrorReason.NOT_FOUND)
+
+    assert locate_account_settings("nobody", resolver=lambda u, token: failed,
+                                   discover=lambda token: {}) == (failed, [])
+
+
+def test_failed_lookup_stops_discovery_without_waiting():
+    stopped = threading.Event()
+    failed = LookupResult(error=LookupErrorReason.NOT_FOUND)
+
+    def discover(token=None):
+        try:
+            token.wait(5)  # a slow drive probe
+        except OperationCancelled:
+            stopped.set()
+            raise
+        return {}
+
+    start = time.monotonic()
+    assert locate_account_settings("nobody", resolver=lambda u, token: failed, discover=discover) == (failed, [])
+
+    assert time.monotonic() - start < 1
+    assert stopped.wait(1)
+    assert all(t.daemon for t in threading.enumerate() if t.name == "server-change-discovery")
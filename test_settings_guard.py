@@ -0,0 +1,66 @@
+"""
+Tests for re-applying a pinned DataCenterHint after the game reverts it
+"""
+
+import threading
+
+import pytest
+
+from settings_guard import ServerSettingGuard, _load_inotify
+
+
+@pytest.mark.parametrize("use_inotify", [
+    pytest.param(True, marks=pytest.mark.skipif(_load_inotify() is None, reason="inotify not available")),
+    False,
+])
+def test_reverted_hint_is_reapplied(tmp_path, use_inotify):
+    settings_file = tmp_path / "GameSettings.ini"
+    settings_file.write_bytes(b"[ONLINE]\r\nDataCenterHint=playfab/westus\r\n")
+    reapplied = []
+    done = threading.Event()
+
+    def on_reapply(file_path, reverted_value):
+        reapplied.append((file_path, reverted_value))
+        done.set()
+
+    guard = ServerSettingGuard([settings_file], "playfab/westus", on_reapply=on_reapply,
+                               debounce=0.05, min_poll_interval=0.02, max_poll_interval=0.1,
+                               use_inotify=use_inotify)
+    guard.start()
+    try:
+        assert guard.backend == ("inotify" if use_inotify else "poll")
+
+        # The game rewrites the file in several writes on exit
+        with open(settings_file, "wb") as f:
+            f.write(b"[ONLINE]\r\n")
+            f.flush()
+            f.write(b"DataCenterHint=default\r\n")
+
+        assert done.wait(5)
+    finally:
+        guard.stop()
+
+    assert reapplied == [(settings_file, "default")]
+    assert settings_file.read_bytes() == b"[ONLINE]\r\nDataCenterHint=playfab/westus\r\n"
+    assert not guard.running
+
+
+def test_initial_reapply_runs_on_the_guard_thread(tmp_path):
+    settings_file = tmp_path / "GameSettings.ini"
+    settings_file.write_bytes(b"[ONLINE]\nDataCenterHint=default\n")
+    threads = []
+    done = threading.Event()
+
+    def on_reapply(file_path, reverted_value):
+        threads.append(threading.current_thread().name)
+        done.set()
+
+    guard = ServerSettingGuard([settings_file], "playfab/westus", on_reapply=on_reapply, use_inotify=False)
+    guard.start()
+    try:
+        assert done.wait(5)
+    finally:
+        guard.stop()
+
+    assert threads == ["server-setting-guard"]
+    assert settings_file.read_bytes() == b"[ONLINE]\nDataCenterHint=playfab/westus\n"
@@ -0,0 +1,60 @@
+"""
+Tests for mirroring one account's GameSettings.ini onto other accounts
+"""
+
+from settings_sync import SYNC_IN_SYNC, SYNC_UPDATED, sync_settings
+
+
+SOURCE = b"[DISPLAY]\r\nBrightness=70\r\nFOV=90\r\n\r\n[ONLINE]\r\nDataCenterHint=playfab/westus\r\n"
+
+
+def make_account(root, account_id, data):
+    folder = root / account_id
+    folder.mkdir()
+    settings_file = folder / "GameSettings.ini"
+    settings_file.write_bytes(data)
+    return settings_file
+
+
+def test_only_differing_keys_are_written(tmp_path):
+    source = make_account(tmp_path, "golden", SOURCE)
+    in_sync = make_account(tmp_path, "same", SOURCE)
+    stale = make_account(tmp_path, "stale", b"; keep me\n[DISPLAY]\nBrightness = 50\nFOV=90\n\n[ONLINE]\nRegion=eu\n")
+
+    results = sync_settings(source, [source, in_sync, stale])
+
+    assert [r.account_id for r in results] == ["same", "stale"]
+    assert results[0].status == SYNC_IN_SYNC
+    assert results[1].status == SYNC_UPDATED
+    assert results[1].changes == {
+        ("DISPLAY", "Brightness"): ("50", "70"),
+        ("ONLINE", "DataCenterHint"): (None, "playfab/westus"),
+    }
+    assert stale.read_bytes() == (
+        b"; keep me\n[DISPLAY]\nBrightness = 70\nFOV=90\n\n[ONLINE]\nRegion=eu\nDataCenterHint=playfab/westus\n"
+    )
+
+
+def test_include_exclude_and_dry_run(tmp_path):
+    source = make_account(tmp_path, "golden", SOURCE)
+    original = b"[DISPLAY]\nBrightness=10\nFOV=60\n[ONLINE]\nDataCenterHint=default\n"
+    target = make_account(tmp_path, "other", original)
+
+    results = sync_settings(source, [target], include=["DISPLAY/*"], exclude=["FOV"], dry_run=True)
+
+    assert results[0].changes == {("DISPLAY", "Brightness"): ("10", "70")}
+    assert target.read_bytes() == original
+
+
+def test_keys_before_first_header_stay_before_it(tmp_path):
+    source = make_account(tmp_path, "golden", b"Version=3\n[DISPLAY]\nFOV=90\n")
+    no_header_keys = make_account(tmp_path, "bare", b"[DISPLAY]\nFOV=90\n[ONLINE]\nRegion=eu\n")
+    with_bom = make_account(tmp_path, "bom", b"\xef\xbb\xbf[DISPLAY]\nFOV=90\n")
+    other_key = make_account(tmp_path, "other", b"; header\nBuild=7\n\n[DISPLAY]\nFOV=90\n")
+
+    results = sync_settings(source, [no_header_keys, with_bom, other_key])
+
+    assert [r.changes for r in results] == [{(None, "Version"): (None, "3")}] * 3
+    assert no_header_keys.read_bytes() == b"Version=3\n[DISPLAY]\nFOV=90\n[ONLINE]\nRegion=eu\n"
+    assert with_bom.read_bytes() == b"\xef\xbb\xbfVersion=3\n[DISPLAY]\nFOV=90\n"
+    assert other_key.read_bytes() == b"; header\nBuild=7\nVersion=3\n\n[DISPLAY]\nFOV=90\n"
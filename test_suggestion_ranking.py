@@ -0,0 +1,62 @@
+"""
+Tests for ranking stats.cc search suggestions against the requested username
+"""
+
+from ubisoft_id_fetcher import (
+    MATCH_CASE_INSENSITIVE,
+    MATCH_EXACT,
+    MATCH_PREFIX,
+    STATS_BASE_URL,
+    _profile_url_regex,
+    pick_suggestion_id,
+    rank_suggestions,
+)
+
+
+PROFILE_RE = _profile_url_regex(STATS_BASE_URL)
+SAUNI_URL = "https://stats.cc/siege/sauni./934e0849-2c26-4067-a66a-7636c152d0e5"
+
+
+def test_exact_match_beats_earlier_partial_matches():
+    suggestions = [
+        ("https://stats.cc/siege/sauni.alt/11111111-1111-1111-1111-111111111111", "sauni.alt"),
+        ("https://stats.cc/siege/SAUNI./22222222-2222-2222-2222-222222222222", "SAUNI."),
+        (SAUNI_URL, "sauni.\nLevel 300"),
+    ]
+
+    ranked = rank_suggestions("sauni.", suggestions, PROFILE_RE)
+
+    assert [score for score, _, _ in ranked] == [MATCH_EXACT, MATCH_CASE_INSENSITIVE, MATCH_PREFIX]
+    assert ranked[0][1] == SAUNI_URL
+    assert ranked[0][2] == "sauni."
+
+
+def test_unrelated_first_link_is_not_picked():
+    suggestions = [
+        ("https://stats.cc/siege/someone.else/33333333-3333-3333-3333-333333333333", "someone.else"),
+        ("https://stats.cc/siege/leaderboard", "Leaderboard"),
+    ]
+
+    assert rank_suggestions("sauni.", suggestions, PROFILE_RE) == []
+
+
+def test_url_username_is_used_when_link_has_no_text():
+    ranked = rank_suggestions("sauni.", [(SAUNI_URL, "")], PROFILE_RE)
+
+    assert ranked == [(MATCH_EXACT, SAUNI_URL, "sauni.")]
+
+
+def test_prefix_only_match_is_not_picked():
+    suggestions = [("https://stats.cc/siege/bobby/44444444-4444-4444-4444-444444444444", "bobby")]
+
+    assert rank_suggestions("bob", suggestions, PROFILE_RE)[0][0] == MATCH_PREFIX
+    assert pick_suggestion_id("bob", suggestions, PROFILE_RE) is None
+
+
+def test_case_insensitive_match_is_picked():
+    suggestions = [
+        ("https://stats.cc/siege/sauni.alt/11111111-1111-1111-1111-111111111111", "sauni.alt"),
+        ("https://stats.cc/siege/SAUNI./22222222-2222-2222-2222-222222222222", "SAUNI."),
+    ]
+
+    assert pick_suggestion_id("sauni.", suggestions, PROFILE_RE) == "22222222-2222-2222-2222-222222222222"
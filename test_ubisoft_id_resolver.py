@@ -0,0 +1,80 @@
+"""
+Tests for the rate-limited, retrying, coalescing Ubisoft ID resolver
+"""
+
+import threading
+import time
+
+from ubisoft_id_fetcher import LookupErrorReason, LookupResult, TokenBucket, UbisoftIdResolver
+
+
+SAUNI_ID = "934e0849-2c26-4067-a66a-7636c152d0e5"
+
+
+def make_resolver(lookup, **kwargs):
+    kwargs.setdefault("rate", 1000)
+    kwargs.setdefault("burst", 1000)
+    kwargs.setdefault("base_delay", 0.01)
+    return UbisoftIdResolver(lookup, **kwargs)
+
+
+def test_transient_failures_are_retried():
+    outcomes = [LookupResult(error=LookupErrorReason.RATE_LIMITED),
+                LookupResult(error=LookupErrorReason.NETWORK_ERROR),
+                LookupResult(SAUNI_ID)]
+    resolver = make_resolver(lambda username, token=None: outcomes.pop(0))
+
+    result = resolver.resolve("sauni.")
+
+    assert result.ubisoft_id == SAUNI_ID
+    assert result.attempts == 3
+
+
+def test_permanent_failure_and_attempt_limit():
+    calls = []
+
+    def lookup(username, token=None):
+        calls.append(username)
+        return LookupResult(error=LookupErrorReason.NOT_FOUND if username == "nobody"
+                            else LookupErrorReason.SEARCH_UNAVAILABLE)
+
+    resolver = make_resolver(lookup, max_attempts=3)
+
+    assert resolver.resolve("nobody").error == LookupErrorReason.NOT_FOUND
+    assert resolver.resolve("flaky").error == LookupErrorReason.SEARCH_UNAVAILABLE
+    assert calls == ["nobody", "flaky", "flaky", "flaky"]
+
+
+def test_concurrent_requests_for_same_username_share_one_lookup():
+    calls = []
+    release = threading.Event()
+
+    def lookup(username, token=None):
+        calls.append(username)
+        release.wait(5)
+        return LookupResult(SAUNI_ID)
+
+    resolver = make_resolver(lookup)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(resolver.resolve("sauni.")))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == ["sauni."]
+    assert [r.ubisoft_id for r in results] == [SAUNI_ID] * 5
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+
+    # Two free, then two more at 20/s
+    assert 0.08 <= time.monotonic() - start < 0.5
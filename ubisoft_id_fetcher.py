@@ -7,125 +7,555 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 import time
 import re
+import random
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Callable
+from urllib.parse import unquote
 
+from cancellation import CancellationToken, OperationCancelled
 
-def get_ubisoft_id_from_username(username: str) -> tuple[str | None, bool]:
+
+STATS_BASE_URL = "https://stats.cc/siege"
+
+# Lean mode only needs the DOM and the site's own scripts to read one href,
+# so everything below is blocked at the network layer via DevTools
+LEAN_BLOCKED_URL_PATTERNS = [
+    # Images and media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Stylesheets
+    "*.css",
+    # Third-party analytics / ads
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*adservice.google.com*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*cloudflareinsights.com*",
+    "*nitropay.com*",
+    "*clarity.ms*",
+]
+
+LEAN_WINDOW_SIZE = (800, 600)
+
+# Chrome switches that trade speed for a smaller browser footprint
+LOW_MEMORY_ARGUMENTS = [
+    '--renderer-process-limit=1',
+    '--disable-site-isolation-trials',
+    '--js-flags=--max-old-space-size=128',
+    '--disk-cache-size=1',
+    '--media-cache-size=1',
+    '--aggressive-cache-discard',
+]
+
+
+def build_chrome_options(lean: bool = True, low_memory: bool = False) -> webdriver.ChromeOptions:
     """
-    Acquires Ubisoft ID from Ubisoft username by navigating to stats.cc/siege
-    and extracting the ID from the resulting URL.
+    Build Chrome options for the ID lookup browser
+    
+    Args:
+        lean: If True, use the lean profile (eager page loads, no images,
+              small window, no extensions or background networking)
+        low_memory: If True, also cap renderer processes, JS heap and caches
+    
+    Returns:
+        ChromeOptions: Configured options
+    """
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')  # Run in headless mode
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    
+    if lean:
+        # Return from driver.get() at DOMContentLoaded instead of full load
+        options.page_load_strategy = 'eager'
+        options.add_argument(f'--window-size={LEAN_WINDOW_SIZE[0]},{LEAN_WINDOW_SIZE[1]}')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-background-networking')
+        options.add_argument('--disable-component-update')
+        options.add_argument('--disable-default-apps')
+        options.add_argument('--disable-sync')
+        options.add_argument('--no-first-run')
+        options.add_argument('--mute-audio')
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+        })
+    
+    if low_memory:
+        for argument in LOW_MEMORY_ARGUMENTS:
+            options.add_argument(argument)
+    
+    return options
+
+
+def create_driver(lean: bool = True, blocked_url_patterns: list[str] | None = None,
+                  low_memory: bool = False) -> webdriver.Chrome:
+    """
+    Start a Chrome session for the ID lookup
+    
+    Args:
+        lean: If True, use the lean profile and block non-essential requests
+        blocked_url_patterns: URL patterns to block in lean mode
+                              (defaults to LEAN_BLOCKED_URL_PATTERNS)
+        low_memory: If True, use the low-memory Chrome switches
+    
+    Returns:
+        webdriver.Chrome: The driver
+    """
+    driver = webdriver.Chrome(options=build_chrome_options(lean, low_memory))
+    
+    if lean:
+        if blocked_url_patterns is None:
+            blocked_url_patterns = LEAN_BLOCKED_URL_PATTERNS
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(blocked_url_patterns)})
+        except WebDriverException:
+            # Blocking is an optimization only; lookups still work without it
+            pass
+    
+    return driver
+
+
+# Returns [[href, visible text], ...] for every profile link in one round trip
+HARVEST_SUGGESTIONS_SCRIPT = """
+var links = document.querySelectorAll("a[href*='/siege/']");
+var out = [];
+for (var i = 0; i < links.length; i++) {
+    out.push([links[i].href, (links[i].innerText || links[i].textContent || '').trim()]);
+}
+return out;
+"""
+
+# Suggestion match quality, best first
+MATCH_EXACT = 3
+MATCH_CASE_INSENSITIVE = 2
+MATCH_PREFIX = 1
+
+SUGGESTION_TIMEOUT = 2.0
+SUGGESTION_POLL_INTERVAL = 0.1
+
+# Shared budget for finding the search box, and for the post-search navigation
+LOOKUP_TIMEOUT = 15
+
+
+@lru_cache(maxsize=None)
+def _profile_url_regex(base_url: str) -> re.Pattern:
+    """Compiled pattern for <base_url>/<username>/<ubisoft_id> profile URLs (groups: username, id)"""
+    return re.compile(re.escape(base_url) + r'/([^/?#]+)/([a-f0-9-]+)')
+
+
+def clear_lookup_caches():
+    """Drop compiled-pattern caches (they are rebuilt on the next lookup)"""
+    _profile_url_regex.cache_clear()
+
+
+def harvest_suggestions(driver) -> list[tuple[str, str]]:
+    """
+    Collect all profile suggestion links currently on the page
+    
+    Args:
+        driver: Active WebDriver
+    
+    Returns:
+        list: (href, display_text) pairs in page order
+    """
+    try:
+        rows = driver.execute_script(HARVEST_SUGGESTIONS_SCRIPT) or []
+    except WebDriverException:
+        return []
+    return [(row[0], row[1]) for row in rows if row and row[0]]
+
+
+def _match_score(username: str, name: str) -> int:
+    if not name:
+        return 0
+    if name == username:
+        return MATCH_EXACT
+    if name.lower() == username.lower():
+        return MATCH_CASE_INSENSITIVE
+    if name.lower().startswith(username.lower()):
+        return MATCH_PREFIX
+    return 0
+
+
+def rank_suggestions(username: str, suggestions: list[tuple[str, str]],
+                     profile_re: re.Pattern) -> list[tuple[int, str, str]]:
+    """
+    Rank suggestion links by how well their display name matches the username
+    
+    The display name is the first line of the link text; the username segment
+    of the profile URL is used as well, so links without text still rank.
+    Links that are not profile URLs or do not match at all are dropped.
+    
+    Args:
+        username: The Ubisoft username being searched for
+        suggestions: (href, display_text) pairs from harvest_suggestions
+        profile_re: Compiled profile URL pattern (see _profile_url_regex)
+    
+    Returns:
+        list: (score, href, display_name) tuples, best match first; ties keep page order
+    """
+    ranked = []
+    for href, text in suggestions:
+        match = profile_re.match(href)
+        if not match:
+            continue
+        display_name = text.strip().split('\n', 1)[0].strip() if text else ''
+        url_name = unquote(match.group(1))
+        score = max(_match_score(username, display_name), _match_score(username, url_name))
+        if score:
+            ranked.append((score, href, display_name or url_name))
+    ranked.sort(key=lambda item: item[0], reverse=True)
+    return ranked
+
+
+def pick_suggestion_id(username: str, suggestions: list[tuple[str, str]],
+                       profile_re: re.Pattern) -> str | None:
+    """
+    Ubisoft ID of the suggestion that names this username, if there is one
+    
+    Only exact and case-insensitive matches count: a prefix match ("bobby"
+    for "bob") is a different account, so it is never picked.
+    
+    Args:
+        username: The Ubisoft username being searched for
+        suggestions: (href, display_text) pairs from harvest_suggestions
+        profile_re: Compiled profile URL pattern (see _profile_url_regex)
+    
+    Returns:
+        str: The Ubisoft ID, or None if no suggestion is a confident match
+    """
+    ranked = rank_suggestions(username, suggestions, profile_re)
+    if ranked and ranked[0][0] >= MATCH_CASE_INSENSITIVE:
+        return profile_re.match(ranked[0][1]).group(2)
+    return None
+
+
+class LookupErrorReason(Enum):
+    """Why a username could not be resolved (values are user-facing messages)"""
+    NOT_FOUND = "no stats.cc profile matches this username"
+    RATE_LIMITED = "stats.cc is rate limiting requests"
+    SEARCH_UNAVAILABLE = "the stats.cc search box did not load"
+    NETWORK_ERROR = "stats.cc could not be reached"
+    BROWSER_UNAVAILABLE = "Chrome could not be started"
+    BROWSER_ERROR = "the browser session failed"
+
+
+# Worth retrying: the same request may well succeed a little later
+TRANSIENT_ERRORS = frozenset({
+    LookupErrorReason.RATE_LIMITED,
+    LookupErrorReason.SEARCH_UNAVAILABLE,
+    LookupErrorReason.NETWORK_ERROR,
+    LookupErrorReason.BROWSER_ERROR,
+})
+
+# Lower-cased page text that means we are being throttled
+RATE_LIMIT_MARKERS = ("too many requests", "rate limit", "error 1015")
+
+PAGE_TEXT_SCRIPT = "return document.title + ' ' + (document.body ? document.body.innerText.slice(0, 2000) : '');"
+
+
+@dataclass
+class LookupResult:
+    """Outcome of resolving a username"""
+    ubisoft_id: str | None = None
+    error: LookupErrorReason | None = None
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.ubisoft_id is not None
+
+
+def _looks_rate_limited(driver) -> bool:
+    try:
+        text = (driver.execute_script(PAGE_TEXT_SCRIPT) or '').lower()
+    except WebDriverException:
+        return False
+    return any(marker in text for marker in RATE_LIMIT_MARKERS)
+
+
+def lookup_ubisoft_id(username: str, lean: bool = True,
+                      base_url: str = STATS_BASE_URL,
+                      token: CancellationToken | None = None,
+                      low_memory: bool = False) -> LookupResult:
+    """
+    Single attempt at acquiring a Ubisoft ID from a username via stats.cc/siege
     
     Args:
         username: The Ubisoft username to search for
+        lean: If True, use the lean browser profile (see build_chrome_options)
+        base_url: Search page URL (overridable for local fixtures)
+        token: Optional cancellation token; cancelling quits the browser immediately
+        low_memory: If True, start Chrome with LOW_MEMORY_ARGUMENTS
         
     Returns:
-        tuple: (extracted_id, success) where success indicates if ID was found
+        LookupResult: The ID, or the reason it could not be found
+    
+    Raises:
+        OperationCancelled: If token was cancelled or its deadline passed
     """
+    if token is None:
+        token = CancellationToken()
+    token.raise_if_cancelled()
+    
     driver = None
+    unregister = None
     try:
         # Initialize Chrome driver
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')  # Run in headless mode
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        driver = webdriver.Chrome(options=options)
-        
-        driver.get("https://stats.cc/siege")
+        try:
+            driver = create_driver(lean, low_memory=low_memory)
+        except Exception:
+            token.raise_if_cancelled()
+            return LookupResult(error=LookupErrorReason.BROWSER_UNAVAILABLE)
+        # Tearing the session down makes any in-flight WebDriver call fail at once
+        unregister = token.on_cancel(driver.quit)
         
-        # Wait for page to load and find search box
-        wait = WebDriverWait(driver, 15)
+        try:
+            driver.get(base_url)
+        except WebDriverException:
+            token.raise_if_cancelled()
+            return LookupResult(error=LookupErrorReason.NETWORK_ERROR)
         
-        # Try multiple selectors for robustness
-        search_box = None
+        # All selectors share one wait, bounded by the token's deadline
         selectors = [
             (By.XPATH, "//input[@placeholder='Search a profile...']"),
             (By.XPATH, "/html/body/div[1]/div[1]/div/div[2]/div[2]/main/div/div/div[1]/div[2]/input"),
             (By.CSS_SELECTOR, "input[placeholder='Search a profile...']"),
         ]
-        
-        for selector_type, selector_value in selectors:
-            try:
-                search_box = wait.until(EC.presence_of_element_located((selector_type, selector_value)))
-                break
-            except TimeoutException:
-                continue
-        
-        if not search_box:
-            return None, False
+        try:
+            search_box = WebDriverWait(driver, token.remaining(LOOKUP_TIMEOUT)).until(
+                EC.any_of(*(EC.presence_of_element_located(selector) for selector in selectors)))
+        except TimeoutException:
+            token.raise_if_cancelled()
+            if _looks_rate_limited(driver):
+                return LookupResult(error=LookupErrorReason.RATE_LIMITED)
+            return LookupResult(error=LookupErrorReason.SEARCH_UNAVAILABLE)
         
         # Scroll to search box to ensure it's visible
         driver.execute_script("arguments[0].scrollIntoView(true);", search_box)
-        time.sleep(0.5)
+        token.wait(0.5)
         
         # Enter username
         search_box.clear()
         search_box.click()
-        time.sleep(0.3)
+        token.wait(0.3)
         search_box.send_keys(username)
         
-        # Wait for autocomplete suggestions
-        time.sleep(2)
+        # Poll the dropdown until a confident match shows up or time runs out
+        profile_re = _profile_url_regex(base_url)
+        deadline = time.monotonic() + SUGGESTION_TIMEOUT
+        while True:
+            ubisoft_id = pick_suggestion_id(username, harvest_suggestions(driver), profile_re)
+            if ubisoft_id or time.monotonic() >= deadline:
+                break
+            token.wait(SUGGESTION_POLL_INTERVAL)
         
-        # Look for autocomplete suggestions/links
-        url_pattern = r'https://stats\.cc/siege/[^/]+/[a-f0-9-]+'
-        target_url = None
+        if ubisoft_id:
+            # The suggestion href already carries the ID, no need to open the profile
+            return LookupResult(ubisoft_id)
         
+        # No confident suggestion (at best a prefix match, i.e. another account):
+        # submit the search and wait for the profile page
+        search_box.send_keys(Keys.RETURN)
         try:
-            suggestion_links = driver.find_elements(By.CSS_SELECTOR, "a[href*='/siege/']")
-            if suggestion_links:
-                # Find link that matches our username pattern
-                for link in suggestion_links:
-                    href = link.get_attribute('href')
-                    if href and re.match(url_pattern, href) and username.lower() in href.lower():
-                        target_url = href
-                        break
-                
-                # If no exact match found, try first link
-                if not target_url and suggestion_links:
-                    href = suggestion_links[0].get_attribute('href')
-                    if href and re.match(url_pattern, href):
-                        target_url = href
-                
-                # Navigate directly to the URL
-                if target_url:
-                    driver.get(target_url)
-                else:
-                    # Try JavaScript click as fallback
-                    driver.execute_script("arguments[0].click();", suggestion_links[0])
-            else:
-                # If no suggestions found, try pressing Enter
-                search_box.send_keys(Keys.RETURN)
-        except Exception:
-            search_box.send_keys(Keys.RETURN)
-        
-        # Wait for navigation
-        if target_url:
-            time.sleep(2)
-        else:
-            try:
-                wait.until(lambda d: re.match(url_pattern, d.current_url) is not None)
-                time.sleep(1)
-            except TimeoutException:
-                pass
-        
-        current_url = driver.current_url
+            WebDriverWait(driver, token.remaining(LOOKUP_TIMEOUT)).until(
+                lambda d: profile_re.match(d.current_url) is not None)
+        except TimeoutException:
+            pass
         
         # Extract Ubisoft ID from URL
-        url_pattern = r'https://stats\.cc/siege/[^/]+/([a-f0-9-]+)'
-        match = re.search(url_pattern, current_url)
+        match = profile_re.match(driver.current_url)
         
         if match:
-            extracted_id = match.group(1)
-            return extracted_id, True
-        else:
-            return None, False
+            return LookupResult(match.group(2))
+        token.raise_if_cancelled()
+        if _looks_rate_limited(driver):
+            return LookupResult(error=LookupErrorReason.RATE_LIMITED)
+        return LookupResult(error=LookupErrorReason.NOT_FOUND)
             
+    except OperationCancelled:
+        raise
     except Exception:
-        return None, False
+        # A browser error caused by cancellation is reported as the cancellation
+        token.raise_if_cancelled()
+        return LookupResult(error=LookupErrorReason.BROWSER_ERROR)
     finally:
+        if unregister:
+            unregister()
         if driver:
-            driver.quit()
+            try:
+                driver.quit()
+            except Exception:
+                # Already torn down by cancellation
+                pass
+
+
+def get_ubisoft_id_from_username(username: str, lean: bool = True,
+                                 base_url: str = STATS_BASE_URL,
+                                 token: CancellationToken | None = None) -> tuple[str | None, bool]:
+    """
+    Acquires Ubisoft ID from Ubisoft username by navigating to stats.cc/siege
+    and extracting the ID from the resulting URL.
+    
+    Single attempt with no rate limiting; see UbisoftIdResolver for that and
+    for typed error reasons.
+    
+    Args:
+        username: The Ubisoft username to search for
+        lean: If True, use the lean browser profile (see build_chrome_options)
+        base_url: Search page URL (overridable for local fixtures)
+        token: Optional cancellation token; cancelling quits the browser immediately
+        
+    Returns:
+        tuple: (extracted_id, success) where success indicates if ID was found
+    
+    Raises:
+        OperationCancelled: If token was cancelled or its deadline passed
+    """
+    result = lookup_ubisoft_id(username, lean, base_url, token)
+    return result.ubisoft_id, result.ok
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows bursts of `capacity` requests, then
+    `rate` requests per second
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is a queue: each waiter is one token further out
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+    
+    def acquire(self, token: CancellationToken | None = None):
+        """Block until a request may be made"""
+        delay = self._reserve()
+        if delay > 0:
+            if token:
+                token.wait(delay)
+            else:
+                time.sleep(delay)
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class UbisoftIdResolver:
+    """
+    Rate-limited, retrying, coalescing front end for lookup_ubisoft_id
+    
+    - A token bucket spaces out requests to stats.cc
+    - Transient failures (see TRANSIENT_ERRORS) are retried with jittered
+      exponential backoff
+    - Concurrent resolve() calls for the same username share one lookup
+    """
+    
+    def __init__(self, lookup: Callable[..., LookupResult] = lookup_ubisoft_id,
+                 rate: float = 0.5, burst: int = 2, max_attempts: int = 3,
+                 base_delay: float = 1.0, max_delay: float = 10.0):
+        """
+        Args:
+            lookup: Single-attempt lookup, called as lookup(username, token=token)
+            rate: Sustained lookups per second
+            burst: Lookups allowed back to back before rate limiting applies
+            max_attempts: Attempts per resolve, including the first
+            base_delay: Backoff before the first retry (seconds)
+            max_delay: Upper bound on any single backoff (seconds)
+        """
+        self.lookup = lookup
+        # Extra keyword arguments for every lookup (e.g. low_memory=True)
+        self.lookup_options = {}
+        self.limiter = TokenBucket(rate, burst)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._in_flight = {}
+        self._lock = threading.Lock()
+    
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based), with equal jitter"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+    
+    def resolve(self, username: str, token: CancellationToken | None = None) -> LookupResult:
+        """
+        Resolve a username, sharing the lookup with any concurrent caller
+        
+        Raises:
+            OperationCancelled: If token was cancelled or its deadline passed
+        """
+        while True:
+            with self._lock:
+                call = self._in_flight.get(username)
+                leader = call is None
+                if leader:
+                    call = self._in_flight[username] = _InFlight()
+            
+            if leader:
+                try:
+                    call.result = self._resolve_with_retries(username, token)
+                    return call.result
+                finally:
+                    with self._lock:
+                        del self._in_flight[username]
+                    call.done.set()
+            
+            # Follower: wait for the leader, staying responsive to our own token
+            while not call.done.wait(0.1):
+                if token:
+                    token.raise_if_cancelled()
+            if call.result is not None:
+                return call.result
+            # The leader was cancelled; its cancellation is not ours, so try again
+    
+    def _resolve_with_retries(self, username: str, token: CancellationToken | None) -> LookupResult:
+        attempt = 0
+        while True:
+            attempt += 1
+            self.limiter.acquire(token)
+            result = self.lookup(username, token=token, **self.lookup_options)
+            result.attempts = attempt
+            if result.ok or result.error not in TRANSIENT_ERRORS or attempt >= self.max_attempts:
+                return result
+            delay = self.backoff(attempt)
+            if token:
+                token.wait(delay)
+            else:
+                time.sleep(delay)
+
+
+# Shared by everything in the app so limits apply across all lookups
+default_resolver = UbisoftIdResolver()
+
 
+def resolve_ubisoft_id(username: str, token: CancellationToken | None = None) -> LookupResult:
+    """Resolve a username through the shared rate-limited resolver"""
+    return default_resolver.resolve(username, token)